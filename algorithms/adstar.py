@@ -16,6 +16,17 @@ class ADStar(PathfindingAlgorithm):
         self.entry_map = {}
         self.counter = itertools.count()
         self.expanded_nodes = 0  # Track work units (node expansions)
+        self.reset_counts()
+        self.result_cost = float('inf')  # Cost of the returned path, when it reaches the goal
+
+    def reset_counts(self):
+        # Instrumentation tallies, handed to a Counters by find_path
+        self.heap_pushes = self.heap_pops = self.stale_pops = 0
+        self.neighbor_calls = self.relaxations = 0
+
+    def report(self, counters):
+        counters.add(expansions=self.expanded_nodes, heap_pushes=self.heap_pushes, heap_pops=self.heap_pops,
+                     stale_pops=self.stale_pops, neighbor_calls=self.neighbor_calls, relaxations=self.relaxations)
 
     def heuristic(self, node):
         gx, gy = self.goal
@@ -42,12 +53,15 @@ class ADStar(PathfindingAlgorithm):
         if self.entry_map.get((node.x, node.y)) == key:
             return  # Skip duplicate with same key
         heapq.heappush(self.open_list, (key, count, node))
+        self.heap_pushes += 1
         self.entry_map[(node.x, node.y)] = key
 
     def update_vertex(self, node):
         if (node.x, node.y) != self.goal:
             neighbors = self.grid.neighbors(node)
             node.rhs = min((nbr.g + self.cost(node, nbr)) for nbr in neighbors) if neighbors else float('inf')
+            self.neighbor_calls += 1
+            self.relaxations += len(neighbors)
 
         if node.g != node.rhs:
             if (node.x, node.y) not in self.incons:
@@ -78,11 +92,14 @@ class ADStar(PathfindingAlgorithm):
                 break
 
             key, _, u = heapq.heappop(self.open_list)
+            self.heap_pops += 1
             if self.entry_map.get((u.x, u.y)) != key:
+                self.stale_pops += 1
                 iterations += 1
                 continue
 
             self.expanded_nodes += 1  # Count expansion
+            self.neighbor_calls += 1
 
             if u.g > u.rhs:
                 u.g = u.rhs
@@ -126,8 +143,10 @@ class ADStar(PathfindingAlgorithm):
 
         return best_path
 
-    def find_path(self):
+    def find_path(self, counters=None):
+        """counters only receives the A* fallback's counts; report() adds AD*'s own."""
         self.expanded_nodes = 0
+        self.reset_counts()
         self.initialize_nodes()
         start_node = self.grid.get_node(*self.start)
         goal_node = self.grid.get_node(*self.goal)
@@ -138,11 +157,15 @@ class ADStar(PathfindingAlgorithm):
 
         if start_node.g == float('inf') and not best_path:
             print("[AD*] No valid path after AD*. Falling back to A*...")
-            path = AStar(self.grid, self.start, self.goal).find_path()
-            return path, self.expanded_nodes
+            fallback = AStar(self.grid, self.start, self.goal)
+            path, fallback_expanded = fallback.find_path(counters)
+            self.result_cost = fallback.result_cost
+            return path, self.expanded_nodes + fallback_expanded
 
         print("[AD*] Returning best path found.")
         final_path = best_path if best_path else self.extract_path(start_node)
+        # g is the cost-to-goal, so the start's g is the cost of the path it leads along
+        self.result_cost = start_node.g if final_path and final_path[-1] == self.goal else float('inf')
         return final_path, self.expanded_nodes
 
     def replan_after_changes(self, changed_nodes):
@@ -157,6 +180,7 @@ class ADStar(PathfindingAlgorithm):
         current = start_node
         while (current.x, current.y) != self.goal:
             neighbors = self.grid.neighbors(current)
+            self.neighbor_calls += 1
             if not neighbors:
                 break
             current = min(neighbors, key=lambda nbr: nbr.g + self.cost(current, nbr))
@@ -166,6 +190,18 @@ class ADStar(PathfindingAlgorithm):
         return path
 
 
-def find_path(grid, start=None, goal=None):
+def find_path(grid, start=None, goal=None, with_cost=False, counters=None):
+    """
+    (path, expanded_nodes), plus the path cost (the start's g) when with_cost is set.
+    counters (an instrumentation.Counters) receives the run's counts and time.
+    """
     planner = ADStar(grid, start=start, goal=goal)
-    return planner.find_path()
+    if counters is not None:
+        counters.start()
+    path, expanded = planner.find_path(counters)
+    if counters is not None:
+        counters.stop()
+        planner.report(counters)
+    if with_cost:
+        return path, expanded, planner.result_cost
+    return path, expanded
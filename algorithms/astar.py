@@ -10,7 +10,8 @@ class AStar(PathfindingAlgorithm):
         dh = self.grid.get_height(gx, gy) - node.height
         return math.sqrt(dx*dx + dy*dy + dh*dh)
 
-    def find_path(self):
+    def find_path(self, counters=None):
+        self.result_cost = float('inf')  # g of the goal once it is reached
         # Reset nodes
         for row in self.grid.nodes:
             for n in row:
@@ -29,16 +30,26 @@ class AStar(PathfindingAlgorithm):
         open_set = [(start_node.f, start_node)]
         closed = set()
         expanded_nodes = 0  # Track work units
+        pushes = 1
+        pops = stale = relaxations = 0
 
         while open_set:
             _, current = heapq.heappop(open_set)
+            pops += 1
+            if (current.x, current.y) in closed:
+                stale += 1  # Older duplicate of a node already expanded
+                continue
             expanded_nodes += 1  # Count node expansions
 
             if (current.x, current.y) == self.goal:
+                self.result_cost = current.g
                 path = []
                 while current:
                     path.append((current.x, current.y))
                     current = current.parent
+                if counters is not None:
+                    counters.add(expansions=expanded_nodes, heap_pushes=pushes, heap_pops=pops, stale_pops=stale,
+                                 neighbor_calls=expanded_nodes - 1, relaxations=relaxations)
                 return path[::-1], expanded_nodes  # Return path + work units
 
             closed.add((current.x, current.y))
@@ -62,8 +73,25 @@ class AStar(PathfindingAlgorithm):
                     nbr.h = self.heuristic(nbr)
                     nbr.f = nbr.g + nbr.h
                     heapq.heappush(open_set, (nbr.f, nbr))
+                    pushes += 1
+                    relaxations += 1
 
+        if counters is not None:
+            counters.add(expansions=expanded_nodes, heap_pushes=pushes, heap_pops=pops, stale_pops=stale,
+                         neighbor_calls=expanded_nodes, relaxations=relaxations)
         return [], expanded_nodes
 
-def find_path(grid, start=None, goal=None):
-    return AStar(grid, start, goal).find_path()
+def find_path(grid, start=None, goal=None, with_cost=False, counters=None):
+    """
+    (path, expanded_nodes), plus the path cost (the goal's g) when with_cost is set.
+    counters (an instrumentation.Counters) receives the run's counts and time.
+    """
+    planner = AStar(grid, start, goal)
+    if counters is not None:
+        counters.start()
+    path, expanded = planner.find_path(counters)
+    if counters is not None:
+        counters.stop()
+    if with_cost:
+        return path, expanded, planner.result_cost
+    return path, expanded
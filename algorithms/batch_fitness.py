@@ -0,0 +1,169 @@
+import time
+import numpy as np
+import config
+from algorithms.genome import NO_HEADING, build_relative_table, move_table, pack, remove_loops, unpack
+from algorithms.cost_to_go import penalty_field
+
+
+class GridTables:
+    """Flat array snapshot of a grid used to evaluate whole populations at once."""
+
+    def __init__(self, grid, alpha=2.0, beta=1.0, power=2):
+        self.width = grid.width
+        self.height = grid.height
+        self.move = move_table(grid)  # move[cell, gene] -> next cell
+        self.rel_dir = build_relative_table(self.move)  # rel_dir[cell * 5 + heading, gene] -> direction
+        heights = np.array([n.height for row in grid.nodes for n in row], dtype=np.float64)
+
+        # edge_cost[cell, gene] = cost of the step the move table takes, using
+        # the same formula as utils.metrics.path_cost (unit base distance)
+        dz = np.abs(heights[self.move] - heights[:, None])
+        self.edge_cost = (1.0 * (1 + alpha * (dz ** power))) + (beta * (dz ** power))
+        self.penalties = {}  # (mode, goal) -> per-cell goal penalty, see cost_to_go.penalty_field
+
+
+def grid_tables(grid):
+    """GridTables for the grid's current layout, shared until the grid changes."""
+    return grid.cached("grid_tables", GridTables)
+
+
+def goal_penalty(grid, goal, pos, mode=None):
+    """Penalty (mode, default config.PENALTY_MODE) for a path that stops at pos without reaching the goal."""
+    return float(penalty_field(grid_tables(grid), goal, mode)[pos[1] * grid.width + pos[0]])
+
+
+def evaluate_population(population, tables, start, goal, trace=False, encoding=None, penalty=None):
+    """
+    Decode and score every genome of a (pop_size, steps) direction array.
+
+    All walkers advance together one gene at a time through the move table;
+    blocked moves leave a walker in place and walkers stop once they step onto
+    the goal, exactly like the scalar decode_path. Returns (scores, reached)
+    arrays: each row's path_cost, plus goal_penalty where it stops short of
+    the goal. With trace=True a third (pop_size, steps + 1) array holds the
+    cell each walker occupied per step.
+    encoding (default config.GENOME_ENCODING) is "absolute" or "relative",
+    penalty (default config.PENALTY_MODE) the goal penalty mode.
+    """
+    relative = (encoding or config.GENOME_ENCODING) == "relative"
+    pop_size, steps = population.shape
+    width = tables.width
+    goal_cell = goal[1] * width + goal[0]
+    cells = np.full(pop_size, start[1] * width + start[0], dtype=np.int64)
+    costs = np.zeros(pop_size, dtype=np.float64)
+    active = np.ones(pop_size, dtype=bool)
+    if relative:
+        heading = np.full(pop_size, NO_HEADING, dtype=np.int64)
+    if trace:
+        traces = np.empty((pop_size, steps + 1), dtype=np.int32)
+        traces[:, 0] = cells
+
+    for k in range(steps):
+        genes = population[:, k]
+        if relative:
+            # Translate genes into the direction taken; walled-in walkers (-1) stay put
+            genes = tables.rel_dir[cells * (NO_HEADING + 1) + heading, genes]
+            stuck = genes < 0
+            genes[stuck] = 0
+            nxt = np.where(stuck, cells, tables.move[cells, genes])
+        else:
+            nxt = tables.move[cells, genes]
+        moved = active & (nxt != cells)
+        costs[moved] += tables.edge_cost[cells[moved], genes[moved]]
+        cells = np.where(moved, nxt, cells)
+        if relative:
+            heading = np.where(moved, genes, heading)
+        active &= ~(moved & (cells == goal_cell))
+        if trace:
+            traces[:, k + 1] = cells
+        if not active.any():
+            if trace:
+                traces[:, k + 2:] = cells[:, None]
+            break
+
+    scores = costs
+    reached = cells == goal_cell
+    missed = ~reached
+    scores[missed] += penalty_field(tables, goal, penalty)[cells[missed]]
+    if trace:
+        return scores, reached, traces
+    return scores, reached
+
+
+def distinct_indices(rng, count, high, k):
+    """Draw count rows of k distinct indices from range(high) without a Python loop per row."""
+    picks = np.empty((count, k), dtype=np.int64)
+    for j in range(k):
+        draw = rng.integers(0, high - j, size=count)
+        # Shift past earlier picks (in ascending order) to skip duplicates
+        for prev in np.sort(picks[:, :j], axis=1).T:
+            draw += draw >= prev
+        picks[:, j] = draw
+    return picks
+
+
+def repair_population(population, length, tables, start, goal):
+    """
+    Repair operator for the relative encoding: re-encode each packed genome
+    along its own walk with loops and dead-end excursions cut out, so the
+    genes that were spent on them become free for the rest of the path.
+    Genes past the shortened walk are left as they were.
+    """
+    genes = unpack(population, length).copy()
+    _, _, traces = evaluate_population(genes, tables, start, goal, trace=True, encoding="relative")
+    # Relative walkers move on every gene until they stop for good (goal or walled in),
+    # so each walk is a prefix of its trace; pad the rest with unique negatives
+    steps = (traces[:, 1:] != traces[:, :-1]).sum(axis=1)
+    padded = np.where(np.arange(traces.shape[1]) <= steps[:, None], traces, -1 - np.arange(traces.shape[1]))
+    ordered = np.sort(padded, axis=1)
+    looped = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+    if not len(looped):
+        return population
+
+    width = tables.width
+    step_dir = {-width: 0, 1: 1, width: 2, -1: 3}  # cell delta -> DIRECTIONS index
+    rel = tables.rel_dir.tolist()
+    for i in looped.tolist():
+        loop_free = remove_loops(traces[i, :steps[i] + 1].tolist())
+        heading = NO_HEADING
+        for k, (a, b) in enumerate(zip(loop_free, loop_free[1:])):
+            d = step_dir[b - a]
+            genes[i, k] = rel[a * (NO_HEADING + 1) + heading].index(d)
+            heading = d
+    return pack(genes)
+
+
+def score_population(population, length, tables, start, goal, cache, encoding=None, penalty=None, counters=None):
+    """
+    Batch-score a packed (pop_size, packed_size(length)) population, unpacking
+    and decoding only genomes that are not already cached. counters (an
+    instrumentation.Counters) gets the evaluations, cache hits and time.
+    """
+    if counters is not None:
+        t0 = time.perf_counter_ns()
+    scores = np.empty(len(population), dtype=np.float64)
+    reached = np.empty(len(population), dtype=bool)
+    pending = {}  # genome bytes -> row indices still to evaluate
+    for i, row in enumerate(population):
+        key = row.tobytes()
+        hit = cache.get(key)
+        if hit is None:
+            pending.setdefault(key, []).append(i)
+        else:
+            scores[i], reached[i] = hit
+
+    if pending:
+        first_rows = [rows[0] for rows in pending.values()]
+        genes = unpack(population[first_rows], length)
+        new_scores, new_reached = evaluate_population(genes, tables, start, goal,
+                                                      encoding=encoding, penalty=penalty)
+        for (key, rows), sc, ok in zip(pending.items(), new_scores.tolist(), new_reached.tolist()):
+            scores[rows] = sc
+            reached[rows] = ok
+            cache.put(key, (sc, ok))
+
+    cache.end_round()
+    if counters is not None:
+        counters.add(fitness_evaluations=len(pending), cache_hits=len(population) - sum(map(len, pending.values())),
+                     fitness_ns=time.perf_counter_ns() - t0)
+    return scores, reached
@@ -0,0 +1,72 @@
+import heapq
+import numpy as np
+import config
+
+
+def cost_to_go(tables, goal):
+    """
+    Reverse Dijkstra from the goal over the move and edge-cost tables:
+    entry c is the cheapest path_cost from cell c to the goal, inf where the
+    goal cannot be reached (obstacles, walled-off pockets).
+    """
+    cells = tables.width * tables.height
+    move = tables.move.tolist()
+    edge_cost = tables.edge_cost.tolist()
+    predecessors = [[] for _ in range(cells)]
+    for cell in range(cells):
+        for gene, nxt in enumerate(move[cell]):
+            if nxt != cell:
+                predecessors[nxt].append((cell, edge_cost[cell][gene]))
+
+    goal_cell = goal[1] * tables.width + goal[0]
+    dist = [float('inf')] * cells
+    dist[goal_cell] = 0.0
+    open_set = [(0.0, goal_cell)]
+    while open_set:
+        d, cell = heapq.heappop(open_set)
+        if d > dist[cell]:
+            continue
+        for prev, step in predecessors[cell]:
+            nd = d + step
+            if nd < dist[prev]:
+                dist[prev] = nd
+                heapq.heappush(open_set, (nd, prev))
+    return np.array(dist, dtype=np.float64)
+
+
+def penalty_field(tables, goal, mode=None):
+    """
+    Per-cell penalty for a walk that ends on that cell without reaching the goal.
+
+    "euclidean" is the straight-line distance to the goal, "cost_to_go" the
+    true remaining cost around walls and terrain (cells that cannot reach the
+    goal get the worst reachable cost plus their straight-line distance).
+    Both are scaled by max(width, height). Built once per goal and mode and
+    kept on the tables, so it lives exactly as long as the grid version.
+    """
+    if mode is None:
+        mode = config.PENALTY_MODE
+    key = (mode, goal)
+    field = tables.penalties.get(key)
+    if field is not None:
+        return field
+
+    width = tables.width
+    ys, xs = np.divmod(np.arange(width * tables.height), width)
+    dx = goal[0] - xs
+    dy = goal[1] - ys
+    # sqrt of the exact integer distance matches math.hypot bit for bit (np.hypot does not)
+    straight = np.sqrt((dx * dx + dy * dy).astype(np.float64))
+    if mode == "euclidean":
+        field = straight
+    elif mode == "cost_to_go":
+        field = cost_to_go(tables, goal)
+        unreachable = np.isinf(field)
+        worst = field[~unreachable].max() if (~unreachable).any() else 0.0
+        field[unreachable] = worst + straight[unreachable]
+    else:
+        raise ValueError(f"Unknown penalty mode: {mode}")
+
+    field = field * max(width, tables.height)
+    tables.penalties[key] = field
+    return field
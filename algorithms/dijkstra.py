@@ -3,7 +3,8 @@ import heapq
 from algorithms.base import PathfindingAlgorithm
 
 class Dijkstra(PathfindingAlgorithm):
-    def find_path(self):
+    def find_path(self, counters=None):
+        self.result_cost = float('inf')  # g of the goal once it is reached
         # Reset nodes
         for row in self.grid.nodes:
             for n in row:
@@ -16,20 +17,28 @@ class Dijkstra(PathfindingAlgorithm):
         pq = [(0.0, start_node)]
         visited = set()
         expanded_nodes = 0  # Track work units
+        pushes = 1
+        pops = stale = relaxations = 0
 
         while pq:
             cost, current = heapq.heappop(pq)
+            pops += 1
+            if (current.x, current.y) in visited:
+                stale += 1  # Older duplicate of a node already expanded
+                continue
             expanded_nodes += 1  # Count node expansions
 
             if (current.x, current.y) == self.goal:
+                self.result_cost = current.g
                 path = []
                 while current:
                     path.append((current.x, current.y))
                     current = current.parent
+                if counters is not None:
+                    counters.add(expansions=expanded_nodes, heap_pushes=pushes, heap_pops=pops, stale_pops=stale,
+                                 neighbor_calls=expanded_nodes - 1, relaxations=relaxations)
                 return path[::-1], expanded_nodes  # Return path + work units
 
-            if (current.x, current.y) in visited:
-                continue
             visited.add((current.x, current.y))
 
             for nbr in self.grid.neighbors(current):
@@ -46,9 +55,26 @@ class Dijkstra(PathfindingAlgorithm):
                     nbr.g = new_cost
                     nbr.parent = current
                     heapq.heappush(pq, (nbr.g, nbr))
+                    pushes += 1
+                    relaxations += 1
 
+        if counters is not None:
+            counters.add(expansions=expanded_nodes, heap_pushes=pushes, heap_pops=pops, stale_pops=stale,
+                         neighbor_calls=expanded_nodes, relaxations=relaxations)
         return [], expanded_nodes
 
 # Wrapper
-def find_path(grid, start=None, goal=None):
-    return Dijkstra(grid, start, goal).find_path()
+def find_path(grid, start=None, goal=None, with_cost=False, counters=None):
+    """
+    (path, expanded_nodes), plus the path cost (the goal's g) when with_cost is set.
+    counters (an instrumentation.Counters) receives the run's counts and time.
+    """
+    planner = Dijkstra(grid, start, goal)
+    if counters is not None:
+        counters.start()
+    path, expanded = planner.find_path(counters)
+    if counters is not None:
+        counters.stop()
+    if with_cost:
+        return path, expanded, planner.result_cost
+    return path, expanded
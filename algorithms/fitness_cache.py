@@ -0,0 +1,69 @@
+from array import array
+from collections import OrderedDict
+import config
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of genome fitness values.
+
+    Keys are the raw genome bytes, so lookups hash a short byte string instead
+    of re-decoding the genome. Entries are tied to a grid version, the
+    start/goal pair, the goal penalty mode and the genome encoding; any change
+    there empties the cache. One cache should be
+    used per algorithm, since each stores its own value shape.
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = config.FITNESS_CACHE_SIZE if max_size is None else max_size
+        self.entries = OrderedDict()
+        self.tag = None
+        self.hits = 0
+        self.misses = 0
+        self.history = array("d")  # Hit rate per generation / iteration of the current run
+        self._round_hits = 0
+        self._round_lookups = 0
+
+    def bind(self, grid, start, goal, params=None):
+        """Drop all entries if the grid, start/goal, penalty mode or encoding changed since the last bind."""
+        if params is None:
+            params = config
+        tag = (grid.version, start, goal, params.PENALTY_MODE, params.GENOME_ENCODING)
+        if tag != self.tag:
+            self.entries.clear()
+            self.tag = tag
+
+    def start_run(self, grid, start, goal, params=None):
+        self.bind(grid, start, goal, params)
+        self.history = array("d")
+        self._round_hits = 0
+        self._round_lookups = 0
+
+    def get(self, key):
+        self._round_lookups += 1
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self._round_hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def end_round(self):
+        """Close one generation / iteration and record its hit rate."""
+        rate = self._round_hits / self._round_lookups if self._round_lookups else 0.0
+        self.history.append(rate)
+        self._round_hits = 0
+        self._round_lookups = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
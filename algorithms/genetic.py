@@ -1,113 +1,327 @@
-import random
-import math
-from utils.metrics import path_cost
+import multiprocessing as mp
+from array import array
+import numpy as np
+from algorithms.batch_fitness import (grid_tables, evaluate_population, repair_population,
+                                      score_population, distinct_indices)
+from algorithms.genome import (decode_genome, gene_mask, pack, random_genomes, random_genes,
+                               splice, unpack)
+from algorithms.seeding import seed_genomes
+from algorithms.fitness_cache import FitnessCache
+from algorithms.instrumentation import Counters
+from algorithms.stopping import StoppingCriteria
 import config
 
-# Directions: 0:Up, 1:Right, 2:Down, 3:Left
-DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
 
+def breed(population, length, scores, count, mutation_rate, rng, k=3):
+    """
+    Vectorized tournament selection, two-point crossover and mutation for
+    count children, working directly on packed genomes via bit masks.
+    """
+    pop_size = len(population)
+    contenders = distinct_indices(rng, 2 * count, pop_size, k)
+    winners = contenders[np.arange(2 * count), np.argmin(scores[contenders], axis=1)]
+    parents_a = population[winners[:count]]
+    parents_b = population[winners[count:]]
 
-def random_individual():
-    return [random.randrange(len(DIRECTIONS)) for _ in range(config.MAX_STEPS_GA)]
+    cuts = np.sort(distinct_indices(rng, count, length, 2), axis=1)
+    cols = np.arange(length)
+    middle = (cols >= cuts[:, :1]) & (cols < cuts[:, 1:])
+    children = splice(parents_a, parents_b, gene_mask(middle))
 
+    mutated = rng.random((count, length)) < mutation_rate
+    return splice(children, random_genes(rng, count, length), gene_mask(mutated))
 
-def decode_path(ind, grid, start, goal):
-    x, y = start
-    path = [(x, y)]
-    for move in ind:
-        dx, dy = DIRECTIONS[move]
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < grid.width and 0 <= ny < grid.height:
-            node = grid.get_node(nx, ny)
-            if node.is_obstacle:
-                continue
-            x, y = nx, ny
-            path.append((x, y))
-            if (x, y) == goal:
-                break
-    return path
 
+class Island:
+    """
+    One GA population evolving on a fixed grid snapshot.
+
+    Only holds picklable state (grid tables, genomes, RNG) so it can run
+    inside a worker process in island mode.
+    """
+
+    def __init__(self, tables, start, goal, rng, cache, pop_size, steps, mutation_rate, elite_count=2,
+                 seeds=None, population=None, repair=False, encoding=None, penalty=None, counters=None):
+        self.tables = tables
+        self.length = steps
+        self.start = start
+        self.goal = goal
+        self.rng = rng
+        self.cache = cache
+        self.pop_size = pop_size
+        self.mutation_rate = mutation_rate
+        self.elite_count = elite_count
+        self.repair = repair  # Cut loops out of children (relative encoding only)
+        self.encoding = encoding
+        self.penalty = penalty
+        self.counters = counters
+        self.population = random_genomes(rng, pop_size, steps)  # Packed, 2 bits per gene
+        if population is not None:
+            # Resume: start from a population saved by an earlier run
+            self.population[:len(population)] = population[:pop_size]
+        if seeds is not None:
+            # Warm start: the first rows come from a deterministic planner's path
+            self.population[:len(seeds)] = seeds[:pop_size]
+        self.best_score = float('inf')
+        self.best_genome = None
+        self.history = array("d")  # Best score per generation
+        self.no_improvement = 0
+        self.ranked = self.population[:0]  # Last scored generation, best first
+        self.ranked_scores = np.empty(0)
+        self.ranked_reached = np.empty(0, dtype=bool)
+
+    def step(self):
+        """Score the current population and breed the next generation."""
+        # Score the whole population in one batched walk (elites and duplicates come from the cache)
+        scores, reached = score_population(self.population, self.length, self.tables, self.start, self.goal,
+                                           self.cache, self.encoding, self.penalty, self.counters)
+        self.history.append(float(scores.min()))
 
-def fitness(ind, grid, start, goal):
-    path = decode_path(ind, grid, start, goal)
-    cost_val = path_cost(path, grid)  # elevation-aware cost
-    if path[-1] != goal:
-        gx, gy = goal
-        lx, ly = path[-1]
-        penalty = math.hypot(gx - lx, gy - ly) * max(grid.width, grid.height)
-        cost_val += penalty
-    return cost_val, path
+        feasible = np.where(reached, scores, np.inf)
+        best_idx = int(np.argmin(feasible))
+        if feasible[best_idx] < self.best_score:
+            self.best_score = float(feasible[best_idx])
+            self.best_genome = self.population[best_idx].copy()
+            self.no_improvement = 0
 
+        # Sort population by fitness (stable, like sorted())
+        ranked_idx = np.argsort(scores, kind='stable')
+        self.ranked = self.population[ranked_idx]
+        self.ranked_scores = scores[ranked_idx]
+        self.ranked_reached = reached[ranked_idx]
+        elite = self.ranked[:self.elite_count]
+
+        # Adaptive mutation if no improvement for 20 gens
+        mutation_rate = self.mutation_rate
+        if self.no_improvement > 20:
+            mutation_rate = min(0.5, self.mutation_rate * 2)
+        self.no_improvement += 1
+
+        # Generate new population
+        children = breed(self.population, self.length, scores, max(0, self.pop_size - self.elite_count),
+                         mutation_rate, self.rng)
+        if self.repair:
+            children = repair_population(children, self.length, self.tables, self.start, self.goal)
+        self.population = np.concatenate([elite, children])
+
+    def accept_migrants(self, migrants):
+        """Replace the last (non-elite) members of the next generation with incoming migrants."""
+        count = min(len(migrants), self.pop_size - self.elite_count)
+        if count > 0:
+            self.population[-count:] = migrants[:count]
+
+
+def _island_worker(conn, tables, start, goal, seed, pop_size, steps, mutation_rate, migrants, seeds, repair,
+                   encoding, penalty):
+    """Run one island, advancing a batch of generations per request from the parent."""
+    counters = Counters()
+    island = Island(tables, start, goal, np.random.default_rng(seed), FitnessCache(),
+                    pop_size, steps, mutation_rate, seeds=seeds, repair=repair, encoding=encoding, penalty=penalty,
+                    counters=counters)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        generations, incoming = request
+        if incoming is not None:
+            island.accept_migrants(incoming)
+        for _ in range(generations):
+            island.step()
+        conn.send((island.best_score, island.best_genome, island.history[-generations:],
+                   island.cache.history[-generations:], island.ranked[:migrants].copy(), counters.as_dict()))
+        counters.reset()
+    conn.close()
+
+
+def _run_islands(tables, start, goal, seed, islands, cache, stopping, seeds, params, counters=None):
+    """
+    Evolve one population per worker process and migrate the best individuals
+    around a ring every GA_MIGRATION_INTERVAL generations. Stopping rules are
+    checked by the parent, per generation, once each migration epoch returns.
+    Returns (best_score, best_genome, history, generations_run).
+    """
+    island_seeds = np.random.SeedSequence(seed).spawn(islands)
+    ctx = mp.get_context()
+    pipes = []
+    workers = []
+    for island_seed in island_seeds:
+        parent_conn, child_conn = ctx.Pipe()
+        worker = ctx.Process(target=_island_worker,
+                             args=(child_conn, tables, start, goal, island_seed, params.POPULATION_SIZE,
+                                   params.MAX_STEPS_GA, params.MUTATION_RATE, params.GA_MIGRANTS, seeds,
+                                   use_repair(params), params.GENOME_ENCODING, params.PENALTY_MODE),
+                             daemon=True)
+        worker.start()
+        child_conn.close()
+        pipes.append(parent_conn)
+        workers.append(worker)
+
+    best_score = float('inf')
+    best_genome = None
+    history = array("d")
+    incoming = [None] * islands
+    remaining = params.GENERATIONS
+    generations_run = 0
+    stopped = False
+    try:
+        while remaining > 0 and not stopped:
+            generations = min(params.GA_MIGRATION_INTERVAL, remaining)
+            for conn, migrants in zip(pipes, incoming):
+                conn.send((generations, migrants))
+            replies = [conn.recv() for conn in pipes]
 
-def tournament_selection(pop, scores, k=3):
-    selected = random.sample(range(len(pop)), k)
-    best_idx = min(selected, key=lambda i: scores[i])
-    return pop[best_idx]
+            cache.history.extend(sum(rates) / islands for rates in zip(*(r[3] for r in replies)))
+            for score, genome, _, _, _, counts in replies:
+                if counters is not None:
+                    counters.merge(counts)
+                if score < best_score:
+                    best_score = score
+                    best_genome = genome
 
+            # Combined history: best fitness of any island per generation
+            for values in zip(*(r[2] for r in replies)):
+                history.append(min(values))
+                generations_run += 1
+                if not stopped:
+                    evaluations = generations_run * params.POPULATION_SIZE * islands
+                    stopped = stopping.check(history[-1], evaluations, best_score)
 
-def two_point_crossover(a, b):
-    pt1, pt2 = sorted(random.sample(range(len(a)), 2))
-    return a[:pt1] + b[pt1:pt2] + a[pt2:]
+            # Ring topology: island i receives the elite of island i - 1
+            incoming = [replies[i - 1][4] for i in range(islands)]
+            remaining -= generations
+    finally:
+        for conn in pipes:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass  # Worker already gone; its own traceback explains why
+            conn.close()
+        for worker in workers:
+            worker.join()
 
+    return best_score, best_genome, history, generations_run
 
-def mutate(ind, rate):
-    for i in range(len(ind)):
-        if random.random() < rate:
-            ind[i] = random.randrange(len(DIRECTIONS))
 
+def use_repair(params):
+    """Whether children get the loop-removal repair (GENOME_REPAIR, relative encoding only)."""
+    return params.GENOME_ENCODING == "relative" and params.GENOME_REPAIR
 
-def find_path(grid, start=None, goal=None):
+
+def warm_start_seeds(grid, start, goal, rng, params):
+    """Packed seed genomes from a greedy best-first path, or None if it finds no path."""
+    count = max(1, int(params.POPULATION_SIZE * params.WARM_START_FRACTION))
+    seeds = seed_genomes(grid, start, goal, count, params.MAX_STEPS_GA, rng, params.WARM_START_PERTURBATION,
+                         params.GENOME_ENCODING)
+    return pack(seeds) if seeds is not None else None
+
+
+def resume_best(state, tables, start, goal, params):
+    """Re-score a saved best genome on the current grid; returns (score, genome) or (inf, None)."""
+    if state.best_genome is None:
+        return float('inf'), None
+    genes = unpack(state.best_genome[None], params.MAX_STEPS_GA)
+    scores, reached = evaluate_population(genes, tables, start, goal,
+                                          encoding=params.GENOME_ENCODING, penalty=params.PENALTY_MODE)
+    if not reached[0]:
+        return float('inf'), None
+    return float(scores[0]), state.best_genome
+
+
+def find_path(grid, start=None, goal=None, seed=None, cache=None, islands=None, stopping=None,
+              warm_start=None, state=None, params=None, counters=None):
+    """
+    Evolve direction genomes towards the goal.
+
+    With islands > 1 (default config.GA_ISLANDS) each island runs a full
+    POPULATION_SIZE population in its own process and exchanges its best
+    individuals with a neighbour every GA_MIGRATION_INTERVAL generations.
+    stopping (default StoppingCriteria.from_config()) can end the run early;
+    its reason attribute records why the run ended. With warm_start (default
+    config.WARM_START) part of the initial population encodes a greedy
+    best-first path plus small perturbations.
+
+    state (a SearchState) carries the last scored population over to the next
+    call on the same grid and start/goal: only individuals whose paths come
+    near cells that changed since are re-scored. In island mode only the best
+    genome is carried over, as a seed for every island.
+
+    params (default the config module, e.g. config.snapshot(MUTATION_RATE=0.05))
+    supplies every setting, so runs with different settings can share a process.
+    counters (an instrumentation.Counters) receives the run's counts and time,
+    including those of island workers.
+    """
+    if counters is not None:
+        counters.start()
+    if params is None:
+        params = config
     if start is None:
-        start = config.START
+        start = params.START
     if goal is None:
-        goal = config.GOAL
+        goal = params.GOAL
+    if islands is None:
+        islands = params.GA_ISLANDS
+    if warm_start is None:
+        warm_start = params.WARM_START
 
-    population = [random_individual() for _ in range(config.POPULATION_SIZE)]
-    best_score = float('inf')
-    best_path = []
-    history = []
-    no_improvement = 0
-
-    for gen in range(config.GENERATIONS):
-        scores = []
-        best_gen_fitness = float('inf')
-
-        for ind in population:
-            sc, p = fitness(ind, grid, start, goal)
-            scores.append(sc)
-            if sc < best_gen_fitness:
-                best_gen_fitness = sc
-            if sc < best_score and p[-1] == goal:
-                best_score = sc
-                best_path = p
-                no_improvement = 0
-
-        history.append(best_gen_fitness)
-
-        # Sort population by fitness
-        ranked_idx = sorted(range(len(population)), key=lambda i: scores[i])
-        elite_count = 2
-        elite = [population[i][:] for i in ranked_idx[:elite_count]]
+    if cache is None:
+        cache = FitnessCache(params.FITNESS_CACHE_SIZE)
+    cache.start_run(grid, start, goal, params)
+    if stopping is None:
+        stopping = StoppingCriteria.from_config(params=params)
+    stopping.start()
+    tables = grid_tables(grid)
+    rng = np.random.default_rng(seed)
+    seeds = warm_start_seeds(grid, start, goal, rng, params) if warm_start else None
 
-        # Adaptive mutation if no improvement for 20 gens
-        mutation_rate = config.MUTATION_RATE
-        if no_improvement > 20:
-            mutation_rate = min(0.5, config.MUTATION_RATE * 2)
-        no_improvement += 1
+    resumed = state is not None and state.resumable("GA", grid, start, goal, params)
+    population = None
+    if resumed:
+        if state.population is not None and islands <= 1:
+            state.prefill(cache, grid)
+            population = state.population
+        elif state.best_genome is not None:
+            carried = state.best_genome[None]
+            seeds = carried if seeds is None else np.concatenate([carried, seeds])
 
-        # Generate new population
-        new_population = elite[:]
-        while len(new_population) < config.POPULATION_SIZE:
-            p1 = tournament_selection(population, scores)
-            p2 = tournament_selection(population, scores)
-            child = two_point_crossover(p1, p2)
-            mutate(child, mutation_rate)
-            new_population.append(child)
-        population = new_population
+    if islands > 1:
+        best_score, best_genome, history, generations_run = _run_islands(tables, start, goal, seed, islands,
+                                                                         cache, stopping, seeds, params, counters)
+    else:
+        island = Island(tables, start, goal, rng, cache,
+                        params.POPULATION_SIZE, params.MAX_STEPS_GA, params.MUTATION_RATE, seeds=seeds,
+                        population=population, repair=use_repair(params), encoding=params.GENOME_ENCODING,
+                        penalty=params.PENALTY_MODE, counters=counters)
+        if resumed:
+            island.best_score, island.best_genome = resume_best(state, tables, start, goal, params)
+        generations_run = 0
+        for gen in range(params.GENERATIONS):
+            island.step()
+            generations_run += 1
+            if stopping.check(island.history[-1], generations_run * params.POPULATION_SIZE, island.best_score):
+                break
+        best_genome, best_score, history = island.best_genome, island.best_score, island.history
+    stopping.finish()
+
+    if state is not None:
+        state.clear()
+        state.save("GA", grid, start, goal, params)
+        state.best_genome = best_genome
+        state.best_score = best_score
+        if islands <= 1 and len(island.ranked):
+            state.save_population(island.ranked, params.MAX_STEPS_GA, island.ranked_scores,
+                                  island.ranked_reached, tables)
+
+    if best_genome is not None:
+        best_path = decode_genome(unpack(best_genome, params.MAX_STEPS_GA).tolist(), grid, start, goal,
+                                  params.GENOME_ENCODING)
+    else:
+        best_path = []
 
     # Calculate work units (proxy for computing power)
-    work_units = config.GENERATIONS * config.POPULATION_SIZE
+    work_units = generations_run * params.POPULATION_SIZE * max(1, islands)
 
+    if counters is not None:
+        counters.stop()
     return best_path, history, work_units
 
 
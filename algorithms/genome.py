@@ -0,0 +1,205 @@
+import numpy as np
+import config
+
+# Directions: 0:Up, 1:Right, 2:Down, 3:Left (shared by GA, SA and SSA genomes)
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+GENES_PER_BYTE = 4  # 2 bits per direction gene
+NO_HEADING = len(DIRECTIONS)  # Heading index before the first move (relative encoding)
+
+_SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+
+def packed_size(length):
+    """Bytes needed to store a genome of length genes."""
+    return (length + GENES_PER_BYTE - 1) // GENES_PER_BYTE
+
+
+def pack(genes):
+    """Pack (..., length) direction genes (0-3) into (..., packed_size(length)) uint8."""
+    genes = np.asarray(genes, dtype=np.uint8)
+    length = genes.shape[-1]
+    pad = packed_size(length) * GENES_PER_BYTE - length
+    if pad:
+        genes = np.concatenate([genes, np.zeros(genes.shape[:-1] + (pad,), dtype=np.uint8)], axis=-1)
+    grouped = genes.reshape(genes.shape[:-1] + (-1, GENES_PER_BYTE))
+    return np.bitwise_or.reduce(grouped << _SHIFTS, axis=-1).astype(np.uint8)
+
+
+def unpack(packed, length):
+    """Inverse of pack: (..., bytes) uint8 -> (..., length) uint8 genes."""
+    packed = np.asarray(packed, dtype=np.uint8)
+    genes = (packed[..., None] >> _SHIFTS) & 3
+    return genes.reshape(packed.shape[:-1] + (-1,))[..., :length]
+
+
+def gene_mask(mask):
+    """Turn a (..., length) boolean gene mask into a packed bit mask (0b11 per selected gene)."""
+    return pack(np.asarray(mask, dtype=np.uint8) * 3)
+
+
+def random_genomes(rng, count, length):
+    """count uniformly random packed genomes; padding bits are zeroed so equal genomes have equal bytes."""
+    packed = rng.integers(0, 256, size=(count, packed_size(length)), dtype=np.uint8)
+    packed[:, -1] &= _pad_mask(length)
+    return packed
+
+
+def random_genes(rng, count, length):
+    """Random bytes in packed layout, used as the source values for mutation."""
+    return rng.integers(0, 256, size=(count, packed_size(length)), dtype=np.uint8)
+
+
+def splice(base, other, mask):
+    """Take genes from other where the packed mask is set, and from base elsewhere."""
+    return (base & ~mask) | (other & mask)
+
+
+def _pad_mask(length):
+    used = length - (packed_size(length) - 1) * GENES_PER_BYTE
+    return np.uint8((1 << (2 * used)) - 1)
+
+
+def obstacle_mask(grid):
+    """Flat (width * height,) boolean obstacle mask for the grid's current layout."""
+    return grid.cached("obstacle_mask",
+                       lambda g: np.array([n.is_obstacle for row in g.nodes for n in row], dtype=bool))
+
+
+def build_move_table(grid):
+    """
+    next_cell[c, d]: flat index (y * width + x) reached from cell c with gene d.
+    Moves off the grid or into an obstacle leave the walker in place (== c).
+    """
+    width, height = grid.width, grid.height
+    blocked = obstacle_mask(grid).reshape(height, width)
+    ys, xs = np.divmod(np.arange(width * height), width)
+    table = np.empty((width * height, len(DIRECTIONS)), dtype=np.int64)
+    for d, (dx, dy) in enumerate(DIRECTIONS):
+        nx, ny = xs + dx, ys + dy
+        ok = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        ok[ok] = ~blocked[ny[ok], nx[ok]]
+        table[:, d] = np.where(ok, ny * width + nx, ys * width + xs)
+    return table
+
+
+def move_table(grid):
+    """Move table for the grid's current layout, rebuilt only when the grid version changes."""
+    return grid.cached("move_table", build_move_table)
+
+
+def move_lists(grid):
+    """Move table as nested Python lists, for scalar decoders."""
+    return grid.cached("move_lists", lambda g: move_table(g).tolist())
+
+
+def build_relative_table(move):
+    """
+    Relative encoding: gene g picks the (g mod n)-th of the n valid moves out
+    of a cell, in DIRECTIONS order, never stepping straight back to the cell
+    just left unless that is the only way out (a dead end).
+    rel_dir[cell * 5 + heading, g] is the direction taken (-1 for a walled-in
+    cell), where heading is the direction of the previous move or NO_HEADING.
+    """
+    cells, dirs = move.shape
+    valid = move != np.arange(cells)[:, None]
+    headings = np.repeat(valid[:, None, :], dirs + 1, axis=1)  # (cells, heading, d)
+    for heading in range(dirs):
+        back = (heading + 2) % dirs
+        allowed = headings[:, heading]
+        forward = allowed.copy()
+        forward[:, back] = False
+        headings[:, heading] = np.where(forward.any(axis=1)[:, None], forward, allowed)
+
+    allowed = headings.reshape(-1, dirs)
+    count = allowed.sum(axis=1)
+    order = np.argsort(~allowed, axis=1, kind='stable')  # Allowed directions first, in order
+    picks = np.arange(dirs)[None, :] % np.maximum(count, 1)[:, None]
+    rel_dir = np.take_along_axis(order, picks, axis=1)
+    rel_dir[count == 0] = -1
+    return rel_dir
+
+
+def relative_table(grid):
+    """Relative-encoding table for the grid's current layout, see build_relative_table."""
+    return grid.cached("relative_table", lambda g: build_relative_table(move_table(g)))
+
+
+def relative_lists(grid):
+    return grid.cached("relative_lists", lambda g: relative_table(g).tolist())
+
+
+def decode_relative(genes, grid, start, goal):
+    """Like decode_path, for genomes in the relative (valid-neighbour) encoding."""
+    width = grid.width
+    table = move_lists(grid)
+    rel = relative_lists(grid)
+    cell = start[1] * width + start[0]
+    goal_cell = goal[1] * width + goal[0]
+    heading = NO_HEADING
+    path = [start]
+    for gene in genes:
+        d = rel[cell * (NO_HEADING + 1) + heading][gene]
+        if d < 0:
+            break  # Walled in: no gene can move
+        cell = table[cell][d]
+        heading = d
+        path.append((cell % width, cell // width))
+        if cell == goal_cell:
+            break
+    return path
+
+
+def encode_relative(path, grid):
+    """
+    Relative genes that walk a 4-connected path. Stops early at a step the
+    encoding cannot express (a back-step out of a cell that is not a dead end).
+    """
+    rel = relative_lists(grid)
+    width = grid.width
+    genes = []
+    heading = NO_HEADING
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        d = DIRECTIONS.index((x2 - x1, y2 - y1))
+        options = rel[(y1 * width + x1) * (NO_HEADING + 1) + heading]
+        if d not in options:
+            break
+        genes.append(options.index(d))
+        heading = d
+    return genes
+
+
+def remove_loops(path):
+    """Cut every loop (and so every dead-end excursion) out of a path, keeping its endpoints."""
+    last = {cell: i for i, cell in enumerate(path)}
+    trimmed = []
+    i = 0
+    while i < len(path):
+        trimmed.append(path[i])
+        i = last[path[i]] + 1
+    return trimmed
+
+
+def decode_genome(genes, grid, start, goal, encoding=None):
+    """Decode with the configured genome encoding ("absolute" or "relative")."""
+    if encoding is None:
+        encoding = config.GENOME_ENCODING
+    if encoding == "relative":
+        return decode_relative(genes, grid, start, goal)
+    return decode_path(genes, grid, start, goal)
+
+
+def decode_path(genes, grid, start, goal):
+    """Convert a direction sequence into the cells visited, stopping at the goal."""
+    width = grid.width
+    table = move_lists(grid)
+    cell = start[1] * width + start[0]
+    goal_cell = goal[1] * width + goal[0]
+    path = [start]
+    for gene in genes:
+        nxt = table[cell][gene]
+        if nxt != cell:
+            cell = nxt
+            path.append((cell % width, cell // width))
+            if cell == goal_cell:
+                break
+    return path
@@ -0,0 +1,66 @@
+import time
+
+
+class Counters:
+    """
+    Hot-path counters shared by every planner, passed as find_path(..., counters=...).
+
+    Graph planners (A*, Dijkstra, AD*) count expansions, heap pushes / pops,
+    stale pops (entries skipped because the node was already closed or its
+    key is outdated), neighbour calls and edge relaxations. Metaheuristics
+    (GA, SA, SSA) count fitness evaluations (genomes actually decoded and
+    scored), cache hits and the time spent scoring. Fields an algorithm does
+    not use stay 0, so as_dict() has the same keys for all six.
+
+    Planners tally into local integers and add them here once per run, so
+    passing no counters (the default) costs nothing in the inner loops.
+    Timings come from time.perf_counter_ns. Counts accumulate until reset().
+    """
+
+    FIELDS = ("expansions", "heap_pushes", "heap_pops", "stale_pops", "neighbor_calls", "relaxations",
+              "fitness_evaluations", "cache_hits", "fitness_ns", "elapsed_ns")
+
+    __slots__ = FIELDS + ("_started",)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+        self._started = None
+
+    def add(self, **counts):
+        for name, value in counts.items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def merge(self, other):
+        """Add the counts of another Counters (or of its as_dict()), e.g. from a worker process."""
+        counts = other if isinstance(other, dict) else other.as_dict()
+        self.add(**{name: counts[name] for name in self.FIELDS})
+
+    def start(self):
+        self._started = time.perf_counter_ns()
+
+    def stop(self):
+        if self._started is not None:
+            self.elapsed_ns += time.perf_counter_ns() - self._started
+            self._started = None
+
+    @property
+    def elapsed(self):
+        """Timed seconds."""
+        return self.elapsed_ns / 1e9
+
+    @property
+    def work_units(self):
+        """Node expansions plus fitness evaluations: the unit of work for any of the six algorithms."""
+        return self.expansions + self.fitness_evaluations
+
+    @property
+    def ops(self):
+        """Work units per timed second."""
+        return self.work_units / self.elapsed if self.elapsed_ns else 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
@@ -0,0 +1,122 @@
+import importlib
+import config
+from algorithms.instrumentation import Counters
+from algorithms.stopping import StoppingCriteria
+from utils.metrics import path_cost
+
+# name -> (module with a find_path function, kind). A module is imported the first time its planner is used.
+# "search" planners return (path, expanded[, cost]); "metaheuristic" ones return (path, history, work_units).
+PLANNERS = {
+    "A*": ("algorithms.astar", "search"),
+    "Dijkstra": ("algorithms.dijkstra", "search"),
+    "AD*": ("algorithms.adstar", "search"),
+    "GA": ("algorithms.genetic", "metaheuristic"),
+    "SA": ("algorithms.simulated_annealing", "metaheuristic"),
+    "SSA": ("algorithms.ssa", "metaheuristic"),
+}
+
+_loaded = {}
+
+
+def register(name, module, kind):
+    """Add a planner: module must define find_path following the return shape of its kind."""
+    if kind not in ("search", "metaheuristic"):
+        raise ValueError(f"Unknown planner kind {kind!r}")
+    PLANNERS[name] = (module, kind)
+    _loaded.pop(name, None)
+
+
+def names(kind=None):
+    """Registered planner names, optionally only those of one kind."""
+    return [name for name, (_, k) in PLANNERS.items() if kind is None or k == kind]
+
+
+def get(name):
+    """find_path of planner name, importing its module on first use."""
+    if name not in _loaded:
+        module, _ = PLANNERS[name]
+        _loaded[name] = importlib.import_module(module).find_path
+    return _loaded[name]
+
+
+class PlanResult:
+    """
+    Outcome of one planner run, the same for every planner.
+
+    path is a list of (x, y) cells (empty if nothing was found) and cost its
+    elevation-aware cost (inf without a path). history is the per-iteration
+    best cost of a metaheuristic, None for search planners. work_units is what
+    the planner reports: expanded nodes, or fitness evaluations / iterations.
+    status is "reached", "partial" (a path that stops short of the goal) or
+    "failed". stop_reason is why a metaheuristic ended (the
+    StoppingCriteria reason: "target", "stall", "max_evaluations",
+    "deadline" or "schedule"), None for search planners.
+    """
+
+    __slots__ = ("algorithm", "path", "cost", "history", "work_units", "counters", "status", "stop_reason")
+
+    def __init__(self, algorithm, path, cost, history, work_units, counters, status, stop_reason=None):
+        self.algorithm = algorithm
+        self.path = path
+        self.cost = cost
+        self.history = history
+        self.work_units = work_units
+        self.counters = counters
+        self.status = status
+        self.stop_reason = stop_reason
+
+    @property
+    def reached(self):
+        return self.status == "reached"
+
+    @property
+    def elapsed(self):
+        return self.counters.elapsed
+
+    def __repr__(self):
+        return (f"PlanResult({self.algorithm!r}, status={self.status!r}, length={len(self.path)}, "
+                f"cost={self.cost:.2f}, work_units={self.work_units}, stop_reason={self.stop_reason!r})")
+
+
+def astar_cost(grid, start=None, goal=None):
+    """A* cost from start to goal, the target for the metaheuristics' "within X% of A*" stopping rule."""
+    return plan("A*", grid, start, goal).cost
+
+
+def plan(name, grid, start=None, goal=None, counters=None, target_cost=None, **kwargs):
+    """
+    Run planner name and wrap its result in a PlanResult. kwargs (cache,
+    state, seed, params, stopping, ...) go to find_path unchanged; counters
+    defaults to a fresh Counters so the result always carries timings.
+
+    Metaheuristics without a stopping argument get
+    StoppingCriteria.from_config(target_cost), so target_cost (e.g. from
+    astar_cost()) enables the STOP_TARGET_GAP rule; search planners ignore it.
+    """
+    if counters is None:
+        counters = Counters()
+    _, kind = PLANNERS[name]
+    find_path = get(name)
+    stop_reason = None
+    if kind == "search":
+        path, work_units, cost = find_path(grid, start, goal, with_cost=True, counters=counters, **kwargs)
+        history = None
+    else:
+        stopping = kwargs.pop("stopping", None)
+        if stopping is None:
+            stopping = StoppingCriteria.from_config(target_cost, kwargs.get("params"))
+        elif target_cost is not None:
+            stopping.target_cost = target_cost
+        path, history, work_units = find_path(grid, start, goal, counters=counters, stopping=stopping, **kwargs)
+        stop_reason = stopping.reason
+        cost = None
+
+    if goal is None:
+        goal = (kwargs.get("params") or config).GOAL
+    if not path:
+        path, cost, status = [], float('inf'), "failed"
+    else:
+        status = "reached" if path[-1] == tuple(goal) else "partial"
+        if cost is None:
+            cost = path_cost(path, grid)
+    return PlanResult(name, path, cost, history, work_units, counters, status, stop_reason)
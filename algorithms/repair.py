@@ -0,0 +1,99 @@
+import math
+import heapq
+import itertools
+import config
+
+
+def segment_cost(a, b, alpha=2.0, beta=1.0, power=2):
+    """Elevation-aware cost of stepping from node a to node b."""
+    dx = b.x - a.x
+    dy = b.y - a.y
+    dz = abs(b.height - a.height)
+
+    base_dist = math.sqrt(dx ** 2 + dy ** 2)
+    penalty_factor = 1 + alpha * (dz ** power)
+    return (base_dist * penalty_factor) + (beta * (dz ** power))
+
+
+def bounded_search(grid, source, target, max_expansions):
+    """
+    A* between two cells that gives up after max_expansions node expansions.
+    Returns (path, expanded_nodes); path is [] when the budget runs out.
+    """
+    tx, ty = target
+    counter = itertools.count()
+    g = {source: 0.0}
+    parent = {source: None}
+    open_set = [(math.hypot(tx - source[0], ty - source[1]), next(counter), source)]
+    closed = set()
+    expanded_nodes = 0
+
+    while open_set and expanded_nodes < max_expansions:
+        _, _, cell = heapq.heappop(open_set)
+        if cell in closed:
+            continue
+        expanded_nodes += 1
+
+        if cell == target:
+            path = []
+            while cell is not None:
+                path.append(cell)
+                cell = parent[cell]
+            return path[::-1], expanded_nodes
+
+        closed.add(cell)
+        current = grid.get_node(*cell)
+        for nbr in grid.neighbors(current):
+            key = (nbr.x, nbr.y)
+            if key in closed:
+                continue
+            tentative_g = g[cell] + segment_cost(current, nbr)
+            if tentative_g < g.get(key, float('inf')):
+                g[key] = tentative_g
+                parent[key] = cell
+                f = tentative_g + math.hypot(tx - nbr.x, ty - nbr.y)
+                heapq.heappush(open_set, (f, next(counter), key))
+
+    return [], expanded_nodes
+
+
+def repair_path(grid, path, blocked, max_expansions=None):
+    """
+    Splice local detours into an existing path around blocked cells.
+
+    Each run of consecutive blocked cells is replaced by a bounded search
+    between the last clear waypoint before it and the first clear waypoint
+    after it. Returns (repaired_path, expanded_nodes); repaired_path is []
+    when any detour fails, so the caller can fall back to a full replan.
+    """
+    if max_expansions is None:
+        max_expansions = config.REPAIR_MAX_EXPANSIONS
+
+    blocked = set(blocked)
+    expanded_nodes = 0
+    if not path or path[0] in blocked:
+        return [], expanded_nodes
+
+    repaired = [path[0]]
+    i = 1
+    while i < len(path):
+        if path[i] not in blocked:
+            repaired.append(path[i])
+            i += 1
+            continue
+
+        # Skip to the first clear waypoint after the blocked run
+        j = i
+        while j < len(path) and path[j] in blocked:
+            j += 1
+        if j == len(path):
+            return [], expanded_nodes  # Nothing left to reconnect to
+
+        detour, work = bounded_search(grid, repaired[-1], path[j], max_expansions)
+        expanded_nodes += work
+        if not detour:
+            return [], expanded_nodes
+        repaired.extend(detour[1:])
+        i = j + 1
+
+    return repaired, expanded_nodes
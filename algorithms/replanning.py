@@ -0,0 +1,51 @@
+from algorithms import registry, repair
+from algorithms.fitness_cache import FitnessCache
+from algorithms.search_state import SearchState
+
+
+class Replanner:
+    """
+    Planner calls for a dynamic scene, shared by the pygame UI and the
+    headless simulator. Keeps one fitness cache (GA, SSA) and one SearchState
+    (GA, SA, SSA) per algorithm across replans, so a replan on a grid that
+    only changed in a few cells reuses the earlier search.
+    """
+
+    def __init__(self):
+        self.fitness_caches = {"GA": FitnessCache(), "SSA": FitnessCache()}
+        self.search_states = {"GA": SearchState(), "SA": SearchState(), "SSA": SearchState()}
+
+    def reset(self):
+        """Forget carried search state, e.g. when the grid is replaced."""
+        for state in self.search_states.values():
+            state.clear()
+
+    def plan(self, name, grid, start=None, goal=None, counters=None, target_cost=None):
+        """Run planner name; returns a registry.PlanResult. target_cost goes to registry.plan."""
+        kwargs = {}
+        if name in self.fitness_caches:
+            kwargs["cache"] = self.fitness_caches[name]
+        if name in self.search_states:
+            kwargs["state"] = self.search_states[name]
+        return registry.plan(name, grid, start, goal, counters, target_cost, **kwargs)
+
+
+def blocked_cells(path, positions):
+    """Cells of path occupied by moving obstacles."""
+    return [pos for pos in path if pos in positions]
+
+
+def repair_or_replan(grid, path, positions, replan):
+    """
+    React to obstacles that moved onto path the way the UI does: try a cheap
+    local detour first and call replan() only if that fails. Returns
+    (new_path, kind, work_units) with kind "clear" (nothing blocked),
+    "repair" or "replan"; work_units is 0 for a replan (replan() reports its own).
+    """
+    blocked = blocked_cells(path, positions)
+    if not blocked:
+        return path, "clear", 0
+    repaired, work_units = repair.repair_path(grid, path, blocked)
+    if repaired:
+        return repaired, "repair", work_units
+    return replan(), "replan", 0
@@ -0,0 +1,97 @@
+import weakref
+import numpy as np
+import config
+from algorithms.batch_fitness import evaluate_population
+from algorithms.genome import obstacle_mask, unpack
+
+
+class SearchState:
+    """
+    Search state handed back by GA, SA and SSA so a replan can resume from it.
+
+    Pass the same instance to successive find_path calls: the algorithm fills
+    it in at the end of a run and picks it up at the start of the next one,
+    as long as it was made on the same grid with the same start and goal.
+    Population-based algorithms also keep the cells each individual visited,
+    so after obstacles move only individuals that came near a changed cell
+    need to be re-scored (all of them with the "cost_to_go" penalty).
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.algorithm = None
+        self.grid_ref = None
+        self.start = None
+        self.goal = None
+        self.penalty_mode = None
+        self.encoding = None
+        self.obstacles = None    # Flat obstacle mask the state was computed against
+        self.population = None   # Packed genomes (GA / SSA)
+        self.scores = None
+        self.reached = None
+        self.traces = None       # Cells visited per individual, see evaluate_population(trace=True)
+        self.genome = None       # Current genome (SA)
+        self.temperature = None  # Temperature reached (SA)
+        self.best_genome = None
+        self.best_score = float('inf')
+
+    def save(self, algorithm, grid, start, goal, params=None):
+        """Tag the state with the grid layout, endpoints and fitness settings it belongs to."""
+        if params is None:
+            params = config
+        self.algorithm = algorithm
+        self.grid_ref = weakref.ref(grid)
+        self.start = start
+        self.goal = goal
+        self.penalty_mode = params.PENALTY_MODE
+        self.encoding = params.GENOME_ENCODING
+        self.obstacles = obstacle_mask(grid)
+
+    def save_population(self, population, length, scores, reached, tables):
+        """Keep a scored packed population together with its decoded traces."""
+        self.population = population.copy()
+        self.scores = np.array(scores, dtype=np.float64)
+        self.reached = np.array(reached, dtype=bool)
+        _, _, self.traces = evaluate_population(unpack(population, length), tables, self.start, self.goal,
+                                                trace=True, encoding=self.encoding, penalty=self.penalty_mode)
+
+    def resumable(self, algorithm, grid, start, goal, params=None):
+        if params is None:
+            params = config
+        return (self.algorithm == algorithm and self.grid_ref is not None and self.grid_ref() is grid
+                and self.start == start and self.goal == goal and self.penalty_mode == params.PENALTY_MODE
+                and self.encoding == params.GENOME_ENCODING)
+
+    def affected(self, grid):
+        """
+        Boolean mask of saved individuals whose score may differ on the grid's
+        current layout: those that stood on or next to a cell whose obstacle
+        status changed (a walker only ever tests the four cells around it).
+        Only the "euclidean" penalty is local like that: the "cost_to_go"
+        field depends on the whole layout, so any change affects everyone.
+        """
+        changed = (obstacle_mask(grid) != self.obstacles).reshape(grid.height, grid.width)
+        if not changed.any():
+            return np.zeros(len(self.traces), dtype=bool)
+        if self.penalty_mode != "euclidean":
+            return np.ones(len(self.traces), dtype=bool)
+        near = changed.copy()
+        near[1:, :] |= changed[:-1, :]
+        near[:-1, :] |= changed[1:, :]
+        near[:, 1:] |= changed[:, :-1]
+        near[:, :-1] |= changed[:, 1:]
+        return near.ravel()[self.traces].any(axis=1)
+
+    def prefill(self, cache, grid):
+        """
+        Put the saved scores of unaffected individuals into a (bound) fitness
+        cache so that only affected individuals are evaluated again.
+        Returns the number of individuals that need re-scoring.
+        """
+        affected = self.affected(grid)
+        for row, score, ok, hit in zip(self.population, self.scores.tolist(), self.reached.tolist(), affected):
+            if not hit:
+                cache.put(row.tobytes(), (score, ok))
+        return int(affected.sum())
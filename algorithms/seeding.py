@@ -0,0 +1,68 @@
+import math
+import heapq
+import numpy as np
+import config
+from algorithms.genome import DIRECTIONS, encode_relative, move_lists
+
+
+def greedy_best_first(grid, start, goal, max_expansions=None):
+    """
+    Cheap deterministic planner: always expand the open cell closest (straight
+    line) to the goal. Not optimal, but typically touches only a thin corridor
+    of cells. Returns the path, or [] if the goal is unreachable within budget.
+    """
+    width = grid.width
+    moves = move_lists(grid)
+    gx, gy = goal
+    start_cell = start[1] * width + start[0]
+    goal_cell = gy * width + gx
+    if max_expansions is None:
+        max_expansions = grid.width * grid.height
+
+    parent = {start_cell: None}
+    open_set = [(math.hypot(gx - start[0], gy - start[1]), start_cell)]
+    expanded = 0
+    while open_set and expanded < max_expansions:
+        _, cell = heapq.heappop(open_set)
+        expanded += 1
+        if cell == goal_cell:
+            path = []
+            while cell is not None:
+                path.append((cell % width, cell // width))
+                cell = parent[cell]
+            return path[::-1]
+        for nxt in moves[cell]:
+            if nxt != cell and nxt not in parent:
+                parent[nxt] = cell
+                nx, ny = nxt % width, nxt // width
+                heapq.heappush(open_set, (math.hypot(gx - nx, gy - ny), nxt))
+    return []
+
+
+def encode_path(path):
+    """Direction genes that walk the given 4-connected path."""
+    return [DIRECTIONS.index((x2 - x1, y2 - y1)) for (x1, y1), (x2, y2) in zip(path, path[1:])]
+
+
+def seed_genomes(grid, start, goal, count, length, rng, perturbation, encoding=None):
+    """
+    count direction genomes (unpacked, shape (count, length)) built from a
+    greedy best-first path. Row 0 is the exact seed; the others have each gene
+    re-drawn with probability perturbation for diversity. Genes past the end of
+    the path are random, since decoding stops at the goal. Returns None when
+    the greedy planner finds no path. encoding defaults to config.GENOME_ENCODING.
+    """
+    path = greedy_best_first(grid, start, goal)
+    if not path:
+        return None
+
+    if (encoding or config.GENOME_ENCODING) == "relative":
+        genes = encode_relative(path, grid)[:length]
+    else:
+        genes = encode_path(path)[:length]
+    seeds = rng.integers(0, len(DIRECTIONS), size=(count, length), dtype=np.uint8)
+    seeds[:, :len(genes)] = genes
+    mutated = rng.random((count, length)) < perturbation
+    mutated[0] = False
+    seeds[mutated] = rng.integers(0, len(DIRECTIONS), size=int(mutated.sum()), dtype=np.uint8)
+    return seeds
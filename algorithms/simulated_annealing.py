@@ -1,83 +1,437 @@
 import random
 import math
+import multiprocessing as mp
+import time
+from array import array
+import numpy as np
 import config
 from utils.metrics import path_cost
-
-# Direction vectors: up, right, down, left
-DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+from algorithms.stopping import StoppingCriteria
+from algorithms.batch_fitness import grid_tables, goal_penalty
+from algorithms.cost_to_go import penalty_field
+from algorithms.genome import DIRECTIONS, decode_path, move_lists
+from algorithms.seeding import encode_path, seed_genomes
 
 def random_solution(length):
     return [random.randrange(len(DIRECTIONS)) for _ in range(length)]
 
-def decode_path(ind, grid, start, goal):
-    x, y = start
-    path = [(x, y)]
-    for gene in ind:
-        dx, dy = DIRECTIONS[gene]
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < grid.width and 0 <= ny < grid.height:
-            node = grid.get_node(nx, ny)
-            if not node.is_obstacle:
-                x, y = nx, ny
-                path.append((x, y))
-                if (x, y) == goal:
-                    break
-    return path
-
-def cost(ind, grid, start, goal):
+def cost(ind, grid, start, goal, penalty_mode=None):
     path = decode_path(ind, grid, start, goal)
     c = path_cost(path, grid)  # ✅ elevation-aware cost
     if path[-1] != goal:
-        gx, gy = goal
-        lx, ly = path[-1]
-        penalty = math.hypot(gx - lx, gy - ly) * max(grid.width, grid.height)
+        penalty = goal_penalty(grid, goal, path[-1], penalty_mode)
         c += penalty
     return c, path
 
-def find_path(grid, start=None, goal=None):
+class AnnealingChain:
+    """
+    One SA state with the decoded walk cached at every gene index.
+
+    cells/prefix_cost/path_len[i] hold the walker state *before* gene i, so a
+    single-gene move at index i only replays the genome from i onwards. Genes
+    after the goal is reached (index >= end) do not affect the path at all.
+    Each replayed gene is one lookup in the shared move and edge-cost tables.
+    With timed set, metropolis_step adds the time spent evaluating proposed
+    moves to fitness_ns.
+    """
+
+    def __init__(self, grid, start, goal, genome, penalty_mode=None):
+        self.width = grid.width
+        self.height = grid.height
+        self.goal = goal
+        self.goal_cell = goal[1] * grid.width + goal[0]
+        self.moves = move_lists(grid)
+        self.edge_cost = grid.cached("edge_cost_lists", lambda g: grid_tables(g).edge_cost.tolist())
+        if penalty_mode is None:
+            penalty_mode = config.PENALTY_MODE
+        self.penalty = grid.cached(("penalty_lists", penalty_mode, goal),
+                                   lambda g: penalty_field(grid_tables(g), goal, penalty_mode).tolist())
+
+        length = len(genome)
+        self.genome = genome
+        self.cells = [start[1] * grid.width + start[0]] * (length + 1)
+        self.prefix_cost = [0.0] * (length + 1)
+        self.path_len = [1] * (length + 1)
+        self.path = [start]
+        self.end = length
+        self.cost = 0.0
+        self.timed = False
+        self.fitness_ns = 0
+        if length:
+            cost_val, trail, end = self.propose(0, genome[0])
+            self.accept(0, genome[0], cost_val, trail, end)
+        else:
+            self.cost = self._score(self.cells[0], 0.0)
+
+    def _score(self, cell, total):
+        # Same as cost(): path cost plus goal penalty
+        c = total
+        if cell != self.goal_cell:
+            c += self.penalty[cell]
+        return c
+
+    def propose(self, idx, gene):
+        """
+        Cost of the genome with gene idx replaced, replaying only the suffix.
+        Returns (cost, trail, end); trail is None when the move cannot change the path.
+        """
+        if idx >= self.end:
+            return self.cost, None, self.end
+
+        genome = self.genome
+        moves = self.moves
+        edge_cost = self.edge_cost
+        goal_cell = self.goal_cell
+        length = len(genome)
+
+        cell, c = self.cells[idx], self.prefix_cost[idx]
+        trail = []  # (cell, prefix cost, moved) after each replayed gene
+        end = length
+        k = idx
+        while True:
+            nxt = moves[cell][gene]
+            moved = nxt != cell
+            if moved:
+                c += edge_cost[cell][gene]  # path_cost segment
+                cell = nxt
+            trail.append((cell, c, moved))
+            k += 1
+            if moved and cell == goal_cell:
+                end = k
+                break
+            if k == length:
+                break
+            gene = genome[k]
+
+        return self._score(cell, c), trail, end
+
+    def accept(self, idx, gene, cost_val, trail, end):
+        """Adopt a proposed move, splicing its replayed suffix into the cached prefix."""
+        self.genome[idx] = gene
+        self.cost = cost_val
+        if trail is None:
+            return
+
+        width = self.width
+        path = self.path[:self.path_len[idx]]
+        i = idx
+        for cell, c, moved in trail:
+            i += 1
+            if moved:
+                path.append((cell % width, cell // width))
+            self.cells[i] = cell
+            self.prefix_cost[i] = c
+            self.path_len[i] = len(path)
+        self.path = path
+        self.end = end
+
+
+def metropolis_step(chain, T):
+    """Propose a single-gene move and accept it with the Metropolis rule at temperature T."""
+    length = len(chain.genome)
+    idx = random.randrange(length)
+    gene = random.randrange(len(DIRECTIONS))
+    # Delta evaluation: only the genes from idx onwards are replayed
+    if chain.timed:
+        t0 = time.perf_counter_ns()
+        neigh_cost, trail, end = chain.propose(idx, gene)
+        chain.fitness_ns += time.perf_counter_ns() - t0
+    else:
+        neigh_cost, trail, end = chain.propose(idx, gene)
+    delta = neigh_cost - chain.cost
+
+    if delta < 0 or random.random() < math.exp(-delta / T):
+        chain.accept(idx, gene, neigh_cost, trail, end)
+        return True
+    # Rejected moves leave the cached prefix untouched
+    return False
+
+
+def schedule_length(params=None):
+    """Number of iterations the geometric cooling schedule runs for."""
+    if params is None:
+        params = config
+    T = params.TEMPERATURE
+    iterations = 0
+    while T > params.MIN_TEMPERATURE:
+        T *= params.COOLING_RATE
+        iterations += 1
+    return iterations
+
+
+def warm_start_solutions(grid, start, goal, count, length, params):
+    """count genomes (lists) seeded from a greedy best-first path, or None if it finds no path."""
+    rng = np.random.default_rng(random.getrandbits(64))
+    # SA always anneals absolute genomes: its delta evaluation replays absolute moves
+    seeds = seed_genomes(grid, start, goal, count, length, rng, params.WARM_START_PERTURBATION, "absolute")
+    return seeds.tolist() if seeds is not None else None
+
+
+def _replica_worker(conn, grid, start, goal, length, seed, initial, penalty_mode, timed):
+    """
+    Run one tempering replica; each request advances it a number of steps at a
+    given temperature. Replies carry the best feasible path and, as a fallback
+    while there is none, the lowest-cost (penalised) path the replica visited.
+    With timed, they also carry the move evaluation time since the last reply.
+    """
+    random.seed(seed)
+    chain = AnnealingChain(grid, start, goal, initial if initial is not None else random_solution(length),
+                           penalty_mode)
+    chain.timed = timed
+    best_cost = float('inf')
+    best_path = []
+    fallback_cost = chain.cost
+    fallback_path = chain.path[:]
+    improved = True  # Send the initial fallback with the first reply
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        steps, T = request
+        history = array("d")
+        for _ in range(steps):
+            if metropolis_step(chain, T):
+                if chain.path[-1] == goal:
+                    if chain.cost < best_cost:
+                        best_cost = chain.cost
+                        best_path = chain.path[:]
+                elif chain.cost < fallback_cost:
+                    fallback_cost = chain.cost
+                    fallback_path = chain.path[:]
+                    improved = True
+            history.append(chain.cost)
+        # The fallback path is only sent when it changed, and is not needed once a feasible path exists
+        fallback = (fallback_cost, fallback_path) if improved and not best_path else None
+        conn.send((chain.cost, best_cost, best_path, history, fallback, chain.fitness_ns))
+        chain.fitness_ns = 0
+        improved = False
+    conn.close()
+
+
+def _run_tempering(grid, start, goal, chains, seed, stopping, initials, params, counters=None):
+    """
+    Parallel tempering: one replica per worker process on a geometric ladder
+    between TEMPERATURE and MIN_TEMPERATURE. Every SA_SWAP_INTERVAL steps,
+    neighbouring temperatures are exchanged with the replica-exchange rule.
+    Stopping rules are checked by the parent after each exchange interval.
+    Returns (best_path, history, work_units); without a feasible path,
+    best_path is the lowest-cost partial path of any replica, like the
+    single-chain mode returns a partial path. counters receives the replicas'
+    move evaluation time.
+    """
+    rng = random.Random(seed)
+    ratio = params.MIN_TEMPERATURE / params.TEMPERATURE
+    ladder = [params.TEMPERATURE * ratio ** (r / (chains - 1)) for r in range(chains)]
+
+    ctx = mp.get_context()
+    pipes = []
+    workers = []
+    for r in range(chains):
+        parent_conn, child_conn = ctx.Pipe()
+        initial = initials[r] if initials is not None else None
+        worker = ctx.Process(target=_replica_worker,
+                             args=(child_conn, grid, start, goal, params.MAX_STEPS_SA, rng.getrandbits(64),
+                                   initial, params.PENALTY_MODE, counters is not None),
+                             daemon=True)
+        worker.start()
+        child_conn.close()
+        pipes.append(parent_conn)
+        workers.append(worker)
+
+    slot = list(range(chains))  # slot[r] = worker currently holding ladder temperature r
+    best_cost = float('inf')
+    best_path = []
+    fallback_cost = float('inf')
+    fallback_path = [start]
+    history = array("d")
+    remaining = schedule_length(params)
+    iterations = 0
+    stopped = False
+    try:
+        while remaining > 0 and not stopped:
+            steps = min(params.SA_SWAP_INTERVAL, remaining)
+            for r, w in enumerate(slot):
+                pipes[w].send((steps, ladder[r]))
+            replies = [conn.recv() for conn in pipes]
+
+            for _, chain_best, chain_path, _, fallback, fitness_ns in replies:
+                if counters is not None:
+                    counters.add(fitness_ns=fitness_ns)
+                if chain_best < best_cost:
+                    best_cost = chain_best
+                    best_path = chain_path
+                if fallback is not None and fallback[0] < fallback_cost:
+                    fallback_cost, fallback_path = fallback
+
+            # Best current cost across all replicas per iteration
+            for values in zip(*(reply[3] for reply in replies)):
+                history.append(min(values))
+                if not stopped:
+                    stopped = stopping.check(history[-1], len(history) * chains, best_cost)
+
+            # Alternate even/odd neighbour pairs so every pair gets a chance
+            for r in range(iterations // params.SA_SWAP_INTERVAL % 2, chains - 1, 2):
+                cold, hot = slot[r + 1], slot[r]
+                e_hot, e_cold = replies[hot][0], replies[cold][0]
+                exponent = (1 / ladder[r + 1] - 1 / ladder[r]) * (e_cold - e_hot)
+                if exponent >= 0 or rng.random() < math.exp(exponent):
+                    slot[r], slot[r + 1] = cold, hot
+
+            remaining -= steps
+            iterations += steps
+    finally:
+        for conn in pipes:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass  # Worker already gone; its own traceback explains why
+            conn.close()
+        for worker in workers:
+            worker.join()
+
+    return best_path or fallback_path, history, iterations * chains
+
+
+def resume_solutions(state, grid, start, goal, length, params):
+    """
+    (genome, temperature, best) to resume from a SearchState: the saved genome,
+    a temperature re-heated to at least TEMPERATURE * SA_REHEAT, and the saved
+    best genome with its cost on the current grid (None if no longer feasible).
+    """
+    temperature = min(params.TEMPERATURE, max(state.temperature, params.TEMPERATURE * params.SA_REHEAT))
+    best = None
+    if state.best_genome is not None:
+        best_cost, best_path = cost(state.best_genome, grid, start, goal, params.PENALTY_MODE)
+        if best_path[-1] == goal:
+            best = (state.best_genome[:], best_cost, best_path)
+    genome = state.genome[:] if state.genome is not None else random_solution(length)
+    return genome, temperature, best
+
+
+def save_state(state, grid, start, goal, genome, temperature, best_genome, best_cost, params):
+    state.clear()
+    state.save("SA", grid, start, goal, params)
+    state.genome = genome
+    state.temperature = temperature
+    state.best_genome = best_genome
+    state.best_score = best_cost
+
+
+def path_genome(path, length):
+    """Genome that walks path, padded with random genes (used to carry tempering results over)."""
+    genes = encode_path(path)[:length]
+    return genes + random_solution(length - len(genes))
+
+
+def find_path(grid, start=None, goal=None, chains=None, seed=None, stopping=None, warm_start=None,
+              state=None, params=None, counters=None):
+    """
+    Anneal a direction genome towards the goal.
+
+    With chains > 1 (default config.SA_CHAINS) replicas run in parallel
+    worker processes as parallel tempering and the best feasible path over
+    all chains is returned; seed makes the replica seeds reproducible.
+    stopping (default StoppingCriteria.from_config()) can end the run early;
+    its reason attribute records why the run ended. With warm_start (default
+    config.WARM_START) the chain starts from a greedy best-first path instead
+    of a random genome.
+
+    state (a SearchState) carries the current genome, temperature and best
+    genome over to the next call on the same grid and start/goal, so a replan
+    continues the schedule from a re-heated temperature instead of from
+    TEMPERATURE. With tempering, every replica resumes from the best path.
+
+    params (default the config module, e.g. config.snapshot(COOLING_RATE=0.99))
+    supplies every setting, so runs with different settings can share a process.
+    counters (an instrumentation.Counters) receives the run's time, its
+    fitness evaluations (one proposal per iteration per chain) and the time
+    spent evaluating them.
+    """
+    if counters is not None:
+        counters.start()
+    if params is None:
+        params = config
     if start is None:
-        start = config.START
+        start = params.START
     if goal is None:
-        goal = config.GOAL
+        goal = params.GOAL
+    if chains is None:
+        chains = params.SA_CHAINS
+    if warm_start is None:
+        warm_start = params.WARM_START
+    length = params.MAX_STEPS_SA
+    initials = warm_start_solutions(grid, start, goal, chains, length, params) if warm_start else None
+    resumed = state is not None and state.resumable("SA", grid, start, goal, params)
+
+    if stopping is None:
+        stopping = StoppingCriteria.from_config(params=params)
+    stopping.start()
+
+    if chains > 1:
+        if resumed and state.genome is not None:
+            initials = [state.genome[:] for _ in range(chains)]
+        result = _run_tempering(grid, start, goal, chains, seed, stopping, initials, params, counters)
+        stopping.finish()
+        if state is not None:
+            best_path = result[0]
+            best_genome = path_genome(best_path, length) if best_path and best_path[-1] == goal else None
+            best_cost = (cost(best_genome, grid, start, goal, params.PENALTY_MODE)[0]
+                         if best_genome is not None else float('inf'))
+            save_state(state, grid, start, goal, best_genome, params.MIN_TEMPERATURE, best_genome, best_cost,
+                       params)
+        if counters is not None:
+            counters.stop()
+            counters.add(fitness_evaluations=result[2])
+        return result
 
-    length = config.MAX_STEPS_SA
-    current = random_solution(length)
-    curr_cost, curr_path = cost(current, grid, start, goal)
-    best = current[:]
-    best_cost = curr_cost
-    best_path = curr_path[:]
+    T = params.TEMPERATURE
+    carried = None
+    if resumed:
+        initial, T, carried = resume_solutions(state, grid, start, goal, length, params)
+    elif initials is not None:
+        initial = initials[0]
+    else:
+        initial = random_solution(length)
+    chain = AnnealingChain(grid, start, goal, initial, params.PENALTY_MODE)
+    chain.timed = counters is not None
+    best = chain.genome[:]
+    best_cost = chain.cost
+    best_path = chain.path[:]
+    if carried is not None and (best_path[-1] != goal or carried[1] < best_cost):
+        best, best_cost, best_path = carried
+    feasible_cost = best_cost if best_path[-1] == goal else float('inf')
 
-    T = config.TEMPERATURE
-    history = []  # per-iteration best cost
+    history = array("d")  # per-iteration current cost
     iterations = 0
 
-    while T > config.MIN_TEMPERATURE:
-        neighbor = current[:]
-        idx = random.randrange(length)
-        neighbor[idx] = random.randrange(len(DIRECTIONS))
-        neigh_cost, neigh_path = cost(neighbor, grid, start, goal)
-        delta = neigh_cost - curr_cost
-
-        if delta < 0 or random.random() < math.exp(-delta / T):
-            current = neighbor
-            curr_cost = neigh_cost
-            curr_path = neigh_path
-            if curr_cost < best_cost and curr_path[-1] == goal:
-                best = current[:]
-                best_cost = curr_cost
-                best_path = curr_path[:]
-
-        history.append(curr_cost)
-        T *= config.COOLING_RATE
+    while T > params.MIN_TEMPERATURE:
+        if metropolis_step(chain, T) and chain.cost < best_cost and chain.path[-1] == goal:
+            best = chain.genome[:]
+            best_cost = chain.cost
+            best_path = chain.path[:]
+            feasible_cost = best_cost
+
+        history.append(chain.cost)
+        T *= params.COOLING_RATE
         # if delta > 0:
         #     T *= 0.99
         # else:
         #     T *= 0.995
         iterations += 1  # Count as one work unit
+        if stopping.check(chain.cost, iterations, feasible_cost):
+            break
+    stopping.finish()
+
+    if state is not None:
+        save_state(state, grid, start, goal, chain.genome[:], T, best if feasible_cost < float('inf') else None,
+                   feasible_cost, params)
 
     # work_units = number of iterations
     work_units = iterations
 
+    if counters is not None:
+        counters.stop()
+        counters.add(fitness_evaluations=work_units, fitness_ns=chain.fitness_ns)
     return best_path, history, work_units
 
 
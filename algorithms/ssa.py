@@ -1,142 +1,170 @@
-import random
-import math
+from array import array
+import numpy as np
 import config
-from utils.metrics import path_cost
-
-# Directions for movement: Up, Right, Down, Left
-DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
-
-def random_solution(length):
-    """Generate a random sequence of directions."""
-    return [random.randint(0, len(DIRECTIONS) - 1) for _ in range(length)]
-
-def decode_path(solution, grid, start, goal):
-    """Convert direction sequence into actual path."""
-    x, y = start
-    path = [(x, y)]
-    for move in solution:
-        dx, dy = DIRECTIONS[move]
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < grid.width and 0 <= ny < grid.height:
-            node = grid.get_node(nx, ny)
-            if not node.is_obstacle:
-                x, y = nx, ny
-                path.append((x, y))
-                if (x, y) == goal:
-                    break
-    return path
-
-def fitness(solution, grid, start, goal):
-    """Fitness = path cost + penalty if goal not reached."""
-    path = decode_path(solution, grid, start, goal)
-    cost = path_cost(path, grid)
-    if path[-1] != goal:  # Penalize if goal not reached
-        gx, gy = goal
-        lx, ly = path[-1]
-        penalty = math.hypot(gx - lx, gy - ly) * max(grid.width, grid.height)
-        cost += penalty
-    return cost, path
-
-def ssa_pathfinding(grid, start=None, goal=None):
+from algorithms.batch_fitness import (grid_tables, evaluate_population, repair_population,
+                                      score_population)
+from algorithms.genome import (decode_genome, gene_mask, pack, random_genomes, random_genes,
+                               splice, unpack)
+from algorithms.fitness_cache import FitnessCache
+from algorithms.stopping import StoppingCriteria
+from algorithms.seeding import seed_genomes
+
+def ssa_pathfinding(grid, start=None, goal=None, cache=None, seed=None, stopping=None, warm_start=None,
+                    state=None, params=None, counters=None):
+    """
+    Sparrow Search over direction genomes.
+
+    state (a SearchState) carries the final flock over to the next call on the
+    same grid and start/goal; only sparrows whose paths come near cells that
+    changed since are re-scored before the search continues.
+
+    params (default the config module, e.g. config.snapshot(SSA_POP_SIZE=60))
+    supplies every setting, so runs with different settings can share a process.
+    counters (an instrumentation.Counters) receives the run's counts and time.
+    """
+    if counters is not None:
+        counters.start()
+    if params is None:
+        params = config
     if start is None:
-        start = config.START
+        start = params.START
     if goal is None:
-        goal = config.GOAL
+        goal = params.GOAL
+    if warm_start is None:
+        warm_start = params.WARM_START
+    if cache is None:
+        cache = FitnessCache(params.FITNESS_CACHE_SIZE)
+    cache.start_run(grid, start, goal, params)
+    if stopping is None:
+        stopping = StoppingCriteria.from_config(params=params)
+    stopping.start()
+
+    encoding = params.GENOME_ENCODING
+    penalty = params.PENALTY_MODE
 
     # SSA Parameters (from paper)
-    pop_size = getattr(config, "SSA_POP_SIZE", 30)
-    max_iter = getattr(config, "SSA_ITERATIONS", 100)
-    max_steps = getattr(config, "MAX_STEPS_SSA", 50)
+    pop_size = getattr(params, "SSA_POP_SIZE", 30)
+    max_iter = getattr(params, "SSA_ITERATIONS", 100)
+    max_steps = getattr(params, "MAX_STEPS_SSA", 50)
 
     PD = int(pop_size * 0.2)  # 20% Producers
     SD = int(pop_size * 0.1)  # 10% Aware of danger
     ST = 0.8                  # Safety threshold
     alpha = 0.8               # Alpha from paper
 
-    # Initialize population
-    population = [random_solution(max_steps) for _ in range(pop_size)]
-    fitness_values = []
-    paths = []
-    for sol in population:
-        f, p = fitness(sol, grid, start, goal)
-        fitness_values.append(f)
-        paths.append(p)
+    # Population is a packed (pop_size, bytes) genome array, 2 bits per gene;
+    # every role update below is a masked bulk operation on rows of it
+    rng = np.random.default_rng(seed)
+    tables = grid_tables(grid)
+    population = random_genomes(rng, pop_size, max_steps)
+    resumed = state is not None and state.resumable("SSA", grid, start, goal, params) and state.population is not None
+    if resumed:
+        state.prefill(cache, grid)
+        population[:len(state.population)] = state.population[:pop_size]
+    elif warm_start:
+        # Seed part of the flock from a greedy best-first path
+        count = max(1, int(pop_size * params.WARM_START_FRACTION))
+        seeds = seed_genomes(grid, start, goal, count, max_steps, rng, params.WARM_START_PERTURBATION, encoding)
+        if seeds is not None:
+            population[:count] = pack(seeds)
+    fitness_values, reached = score_population(population, max_steps, tables, start, goal, cache,
+                                               encoding, penalty, counters)
+    feasible_cost = fitness_values[reached].min() if reached.any() else float('inf')
 
     # Best solution
-    best_idx = min(range(pop_size), key=lambda i: fitness_values[i])
-    best_solution = population[best_idx][:]
-    best_path = paths[best_idx][:]
-    best_score = fitness_values[best_idx]
-
-    convergence = [best_score]
+    best_idx = int(np.argmin(fitness_values))
+    best_solution = population[best_idx].copy()
+    best_score = float(fitness_values[best_idx])
+    if resumed and state.best_genome is not None:
+        carried, _ = evaluate_population(unpack(state.best_genome[None], max_steps), tables, start, goal,
+                                         encoding=encoding, penalty=penalty)
+        if carried[0] < best_score:
+            best_solution = state.best_genome.copy()
+            best_score = float(carried[0])
+
+    convergence = array("d", [best_score])
     iterations = 0
 
+    # Producer search probability per rank, eq. (3)
+    producer_rate = np.exp(-np.arange(PD) / (alpha * max_iter))[:, None]
+
     for t in range(max_iter):
         # Dynamic Environment Update
         if hasattr(grid, "update_dynamic"):
             grid.update_dynamic()
+            tables = grid_tables(grid)
+            cache.bind(grid, start, goal, params)
 
         # Sort by fitness
-        sorted_idx = sorted(range(pop_size), key=lambda i: fitness_values[i])
-        X_best = population[sorted_idx[0]][:]
-        X_worst = population[sorted_idx[-1]][:]
+        sorted_idx = np.argsort(fitness_values, kind='stable')
+        X_best = population[sorted_idx[0]].copy()
+        X_worst = unpack(population[sorted_idx[-1]], max_steps)
 
-        R2 = random.random()  # Alarm value
+        R2 = rng.random()  # Alarm value
 
         # === Update Producers ===
-        for rank, i in enumerate(sorted_idx[:PD]):
-            new_sol = population[i][:]
-            for j in range(len(new_sol)):
-                if R2 < ST:
-                    # Wide search mode: equation (3)
-                    if random.random() < math.exp(-rank / (alpha * max_iter)):
-                        new_sol[j] = random.randint(0, len(DIRECTIONS) - 1)
-                else:
-                    # Escape predator: equation (3)
-                    Q = random.gauss(0, 1)
-                    new_sol[j] = random.randint(0, len(DIRECTIONS) - 1)
-            population[i] = new_sol
+        producers = sorted_idx[:PD]
+        if R2 < ST:
+            # Wide search mode: equation (3)
+            mask = rng.random((PD, max_steps)) < producer_rate
+            population[producers] = splice(population[producers], random_genes(rng, PD, max_steps),
+                                           gene_mask(mask))
+        else:
+            # Escape predator: equation (3)
+            population[producers] = random_genomes(rng, PD, max_steps)
 
         # === Update Scroungers ===
-        for idx, i in enumerate(sorted_idx[PD:], start=PD):
-            new_sol = population[i][:]
-            if i > pop_size // 2:
-                # Eq. (4): Scrounger moves toward worst
-                for j in range(len(new_sol)):
-                    if random.random() < 0.2:
-                        new_sol[j] = random.choice(X_worst)
-            else:
-                # Follow best solution
-                for j in range(len(new_sol)):
-                    if random.random() < 0.5:
-                        new_sol[j] = X_best[j]
-            population[i] = new_sol
+        scroungers = sorted_idx[PD:]
+        # Eq. (4): Scrounger moves toward worst
+        toward_worst = scroungers[scroungers > pop_size // 2]
+        n = len(toward_worst)
+        mask = rng.random((n, max_steps)) < 0.2
+        picks = pack(X_worst[rng.integers(0, max_steps, size=(n, max_steps))])
+        population[toward_worst] = splice(population[toward_worst], picks, gene_mask(mask))
+
+        # Follow best solution
+        followers = scroungers[scroungers <= pop_size // 2]
+        mask = rng.random((len(followers), max_steps)) < 0.5
+        population[followers] = splice(population[followers], X_best, gene_mask(mask))
 
         # === Danger-aware sparrows ===
-        danger_indices = random.sample(sorted_idx, SD)
-        for i in danger_indices:
-            new_sol = population[i][:]
-            for j in range(len(new_sol)):
-                if random.random() < 0.3:
-                    K = random.uniform(-1, 1)
-                    new_sol[j] = random.randint(0, len(DIRECTIONS) - 1)
-            population[i] = new_sol
-
-        # Evaluate all
-        for i in range(pop_size):
-            f, p = fitness(population[i], grid, start, goal)
-            fitness_values[i] = f
-            paths[i] = p
-            if f < best_score:
-                best_score = f
-                best_solution = population[i][:]
-                best_path = p[:]
+        danger_indices = rng.choice(pop_size, size=SD, replace=False)
+        mask = rng.random((SD, max_steps)) < 0.3
+        population[danger_indices] = splice(population[danger_indices], random_genes(rng, SD, max_steps),
+                                            gene_mask(mask))
+
+        if encoding == "relative" and params.GENOME_REPAIR:
+            population = repair_population(population, max_steps, tables, start, goal)
+
+        # Evaluate all in one batched walk
+        fitness_values, reached = score_population(population, max_steps, tables, start, goal, cache,
+                                                   encoding, penalty, counters)
+        i = int(np.argmin(fitness_values))
+        if fitness_values[i] < best_score:
+            best_score = float(fitness_values[i])
+            best_solution = population[i].copy()
+        if reached.any():
+            feasible_cost = min(feasible_cost, fitness_values[reached].min())
 
         convergence.append(best_score)
         iterations += 1
-
+        if stopping.check(best_score, (iterations + 1) * pop_size, feasible_cost):
+            break
+    stopping.finish()
+
+    if state is not None:
+        state.clear()
+        state.save("SSA", grid, start, goal, params)
+        state.save_population(population, max_steps, fitness_values, reached, tables)
+        state.best_genome = best_solution
+        state.best_score = best_score
+
+    best_path = decode_genome(unpack(best_solution, max_steps).tolist(), grid, start, goal, encoding)
+    if counters is not None:
+        counters.stop()
     return best_path, convergence, iterations * pop_size
 
 # Wrapper for compatibility
-def find_path(grid, start=None, goal=None):
-    return ssa_pathfinding(grid, start, goal)
+def find_path(grid, start=None, goal=None, cache=None, seed=None, stopping=None, warm_start=None, state=None,
+              params=None, counters=None):
+    return ssa_pathfinding(grid, start, goal, cache, seed, stopping, warm_start, state, params, counters)
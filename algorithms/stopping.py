@@ -0,0 +1,76 @@
+import time
+import config
+
+
+class StoppingCriteria:
+    """
+    Early-stopping rules shared by the metaheuristics (GA, SA, SSA).
+
+    stall_window: stop after this many generations / iterations without the
+        best cost improving
+    target_cost, target_gap: stop once a feasible path costs at most
+        target_cost * (1 + target_gap), e.g. the A* cost with a 5% gap
+    max_evaluations: stop once this many fitness evaluations were spent
+    time_limit: stop after this many seconds of wall-clock time
+
+    Every rule is off when left as None. After a run, reason holds why the
+    search ended ("stall", "target", "max_evaluations", "deadline" or
+    "schedule" when the full schedule ran).
+    """
+
+    def __init__(self, stall_window=None, target_cost=None, target_gap=0.0,
+                 max_evaluations=None, time_limit=None):
+        self.stall_window = stall_window
+        self.target_cost = target_cost
+        self.target_gap = target_gap
+        self.max_evaluations = max_evaluations
+        self.time_limit = time_limit
+        self.start()
+
+    @classmethod
+    def from_config(cls, target_cost=None, params=None):
+        """Rules from the STOP_* settings of params (default the config module)."""
+        if params is None:
+            params = config
+        return cls(stall_window=params.STOP_STALL_WINDOW,
+                   target_cost=target_cost,
+                   target_gap=params.STOP_TARGET_GAP,
+                   max_evaluations=params.STOP_MAX_EVALUATIONS,
+                   time_limit=params.STOP_TIME_LIMIT)
+
+    def start(self):
+        """Reset the counters; called by the algorithm when its search begins."""
+        self.reason = None
+        self.best = float('inf')
+        self.stalled = 0
+        self.deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+
+    def check(self, best_cost, evaluations, feasible_cost=None):
+        """
+        Record one generation / iteration and return True if the search should stop.
+        best_cost drives the stall rule, feasible_cost (default best_cost) the target rule.
+        """
+        if best_cost < self.best:
+            self.best = best_cost
+            self.stalled = 0
+        else:
+            self.stalled += 1
+
+        if feasible_cost is None:
+            feasible_cost = best_cost
+
+        if self.target_cost is not None and feasible_cost <= self.target_cost * (1 + self.target_gap):
+            self.reason = "target"
+        elif self.stall_window is not None and self.stalled >= self.stall_window:
+            self.reason = "stall"
+        elif self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            self.reason = "max_evaluations"
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.reason = "deadline"
+        return self.reason is not None
+
+    def finish(self):
+        """Mark a run that used its whole schedule; returns the final reason."""
+        if self.reason is None:
+            self.reason = "schedule"
+        return self.reason
@@ -0,0 +1,155 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import time
+import numpy as np
+import config
+from environment.grid import Grid
+from algorithms import registry
+from algorithms.replanning import Replanner, repair_or_replan
+from ui.obstacles import MovingObstacles
+from utils.profiling import describe, profile_run
+
+
+class Simulation:
+    """
+    Headless version of the dynamic UI loop. Every move_interval ticks the
+    moving obstacles step; an agent advances one cell along its path every
+    tick and reacts to obstacles on the rest of its path like the UI does
+    (local repair first, full replan from its current cell otherwise).
+    No frame clock, so it runs as fast as the planners allow. With loop the
+    agent shuttles between start and goal until the tick limit.
+    """
+
+    def __init__(self, algo, grid, obstacle_count=None, move_interval=1, seed=0, start=None, goal=None,
+                 loop=False):
+        self.algo = algo
+        self.grid = grid
+        self.start = config.START if start is None else start
+        self.goal = config.GOAL if goal is None else goal
+        self.move_interval = move_interval
+        self.loop = loop
+        self.trips = 0
+        random.seed(seed)  # Obstacle motion (and SA) draw from the random module
+        self.obstacles = MovingObstacles(grid, count=config.OBSTACLE_COUNT if obstacle_count is None
+                                         else obstacle_count)
+        self.replanner = Replanner()
+        self.position = self.start
+        self.path = []
+        self.latencies = {"repair": [], "replan": []}  # Seconds per reaction
+        self.collisions = 0
+        self.ticks = 0
+
+    def plan(self):
+        """Full plan from the agent's cell; AD*'s progress output is swallowed."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.replanner.plan(self.algo, self.grid, self.position, self.goal)
+        return result.path
+
+    def react(self):
+        """Repair or replan the rest of the path; records the latency of either."""
+        t0 = time.perf_counter_ns()
+        if len(self.path) < 2 or self.path[-1] != self.goal:
+            # No usable path yet (or it stops short of the goal): only a replan helps
+            path, kind = self.plan(), "replan"
+        else:
+            path, kind, _ = repair_or_replan(self.grid, self.path, self.obstacles.positions, self.plan)
+            if kind == "clear":
+                return
+        self.latencies[kind].append((time.perf_counter_ns() - t0) / 1e9)
+        self.path = path if path and path[0] == self.position else [self.position]
+
+    def step(self):
+        self.ticks += 1
+        if self.ticks % self.move_interval == 0:
+            self.obstacles.move()
+            if self.position in self.obstacles.positions:
+                self.collisions += 1
+            self.react()
+        if len(self.path) > 1:
+            self.path = self.path[1:]
+            self.position = self.path[0]
+        if self.loop and self.position == self.goal:
+            self.trips += 1
+            self.start, self.goal = self.goal, self.start
+            self.path = self.plan()
+
+    def run(self, max_ticks):
+        """Tick until the agent reaches the goal (with loop: for max_ticks) or max_ticks; returns a summary dict."""
+        t0 = time.perf_counter()
+        self.path = self.plan()
+        initial = time.perf_counter() - t0
+        while self.ticks < max_ticks and self.position != self.goal:
+            self.step()
+        elapsed = time.perf_counter() - t0
+
+        latencies = self.latencies["repair"] + self.latencies["replan"]
+        return {
+            "algorithm": self.algo,
+            "obstacles": len(self.obstacles.positions),
+            "move_interval": self.move_interval,
+            "ticks": self.ticks,
+            "reached": self.position == self.goal or self.trips > 0,
+            "trips": self.trips,
+            "collisions": self.collisions,
+            "repairs": len(self.latencies["repair"]),
+            "replans": len(self.latencies["replan"]),
+            "replans_per_1000_ticks": 1000 * len(latencies) / self.ticks if self.ticks else 0.0,
+            "initial_plan_ms": initial * 1e3,
+            "latency_median_ms": statistics.median(latencies) * 1e3 if latencies else None,
+            "latency_p95_ms": float(np.percentile(latencies, 95)) * 1e3 if latencies else None,
+            "latency_max_ms": max(latencies) * 1e3 if latencies else None,
+            "ticks_per_second": self.ticks / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless dynamic-obstacle simulation measuring replan latency.")
+    parser.add_argument("--algos", nargs="+", default=["A*", "AD*"], choices=registry.names())
+    parser.add_argument("--obstacles", nargs="+", type=int, default=[config.OBSTACLE_COUNT],
+                        help="Moving obstacle counts")
+    parser.add_argument("--move-interval", nargs="+", type=int, default=[1],
+                        help="Ticks between obstacle moves (1 = every tick)")
+    parser.add_argument("--ticks", type=int, default=2000, help="Tick limit per run")
+    parser.add_argument("--seeds", type=int, default=3, help="Runs (grid and obstacle seeds) per setting")
+    parser.add_argument("--loop", action="store_true", help="Shuttle between start and goal until --ticks")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile each run (cProfile + tracemalloc) into results/profiles/; slows it down")
+    parser.add_argument("--output", default=os.path.join("results", "dynamic_sim.json"))
+    args = parser.parse_args()
+
+    rows = []
+    for algo in args.algos:
+        for count in args.obstacles:
+            for interval in args.move_interval:
+                for seed in range(args.seeds):
+                    random.seed(seed)
+                    grid = Grid()
+                    scenario = f"dynamic_{count}obs_every{interval}_seed{seed}"
+                    with profile_run(algo, scenario, enabled=args.profile) as profile:
+                        row = Simulation(algo, grid, count, interval, seed, loop=args.loop).run(args.ticks)
+                    row["seed"] = seed
+                    rows.append(row)
+                    median = row["latency_median_ms"]
+                    p95 = row["latency_p95_ms"]
+                    print(f"{algo:<8} obstacles {count:>3} interval {interval:>3} seed {seed}: "
+                          f"{row['ticks']} ticks, {row['repairs']} repairs, {row['replans']} replans, "
+                          f"latency median {'-' if median is None else f'{median:.3f}'} ms "
+                          f"p95 {'-' if p95 is None else f'{p95:.3f}'} ms, "
+                          f"{row['collisions']} collisions, {row['ticks_per_second']:.0f} ticks/s, "
+                          f"{'reached' if row['reached'] else 'not reached'}")
+                    if profile is not None:
+                        print(f"  {describe(profile)}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(rows, f, indent=2)
+    print(f"{len(rows)} runs -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
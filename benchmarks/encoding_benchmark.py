@@ -0,0 +1,76 @@
+import argparse
+import statistics
+import sys
+import time
+import config
+from environment.scenarios import make_scenarios
+from algorithms import genetic, ssa
+from algorithms.stopping import StoppingCriteria
+from utils.metrics import path_cost
+
+# (label, GENOME_ENCODING, genome length as a fraction of the configured MAX_STEPS_*)
+VARIANTS = [
+    ("absolute", "absolute", 1.0),
+    ("relative", "relative", 1.0),
+    ("relative-half", "relative", 0.5),
+]
+
+ALGORITHMS = {
+    "GA": (genetic.find_path, "MAX_STEPS_GA"),
+    "SSA": (ssa.find_path, "MAX_STEPS_SSA"),
+}
+
+
+def run_variant(grid, algo, encoding, scale, seed):
+    """One run to the first feasible path and one full run; returns a result dict."""
+    find_path, steps_key = ALGORITHMS[algo]
+    steps = max(1, int(getattr(config, steps_key) * scale))
+    params = config.snapshot(GENOME_ENCODING=encoding, **{steps_key: steps})
+
+    # Any feasible path meets this target, so the run stops at the first one
+    first = StoppingCriteria(target_cost=sys.float_info.max)
+    _, _, first_evals = find_path(grid, seed=seed, stopping=first, params=params)
+
+    t0 = time.perf_counter()
+    path, _, evals = find_path(grid, seed=seed, stopping=StoppingCriteria(), params=params)
+    elapsed = time.perf_counter() - t0
+
+    reached = bool(path) and path[-1] == config.GOAL
+    return {
+        "first_feasible": first_evals if first.reason == "target" else None,
+        "reached": reached,
+        "cost": path_cost(path, grid) if reached else None,
+        "time": elapsed,
+        "evals": evals,
+    }
+
+
+def summarize(runs):
+    firsts = [r["first_feasible"] for r in runs if r["first_feasible"] is not None]
+    costs = [r["cost"] for r in runs if r["cost"] is not None]
+    return {
+        "feasible runs": f"{len(costs)}/{len(runs)}",
+        "median evals to feasible": statistics.median(firsts) if firsts else None,
+        "median best cost": round(statistics.median(costs), 4) if costs else None,
+        "median time (s)": round(statistics.median(r["time"] for r in runs), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare absolute and relative genome encodings for GA / SSA.")
+    parser.add_argument("--seeds", type=int, default=5, help="Grids (and algorithm seeds) per variant")
+    parser.add_argument("--density", type=float, default=config.OBSTACLE_DENSITY, help="Obstacle density")
+    parser.add_argument("--algos", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    args = parser.parse_args()
+
+    grids = make_scenarios(args.seeds, density=args.density)
+
+    for algo in args.algos:
+        for label, encoding, scale in VARIANTS:
+            runs = [run_variant(grid, algo, encoding, scale, seed) for seed, grid in enumerate(grids)]
+            summary = ", ".join(f"{k}: {v}" for k, v in summarize(runs).items())
+            print(f"{algo:<4} {label:<14} {summary}")
+
+
+if __name__ == "__main__":
+    main()
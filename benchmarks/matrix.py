@@ -0,0 +1,171 @@
+import argparse
+import collections
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tracemalloc
+import numpy as np
+import config
+from environment.scenarios import random_grid
+from algorithms import registry
+from utils.profiling import describe, profile_run
+from utils.results_store import ResultsStore
+
+METAHEURISTICS = registry.names("metaheuristic")
+
+
+def size_params(size):
+    """Settings for a size x size grid: corner start / goal, genome lengths scaled like config.py does."""
+    return config.snapshot(START=(0, 0), GOAL=(size - 1, size - 1),
+                           MAX_STEPS_GA=size * 2 * 2, MAX_STEPS_SA=size * 2 * 4, MAX_STEPS_SSA=size * 2 * 4)
+
+
+def run_once(algo, grid, params, seed, target_cost=None):
+    """One run; returns its registry.PlanResult. AD*'s progress output is swallowed."""
+    kwargs = {"seed": seed, "params": params} if algo in METAHEURISTICS else {}
+    random.seed(seed)  # SA draws from the random module
+    with contextlib.redirect_stdout(io.StringIO()):
+        return registry.plan(algo, grid, params.START, params.GOAL, target_cost=target_cost, **kwargs)
+
+
+def peak_memory(algo, grid, params, seed):
+    """Peak traced allocation (bytes) of one extra, untimed run. Worker processes are not traced."""
+    tracemalloc.start()
+    try:
+        run_once(algo, grid, params, seed)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_cell(algo, size, density, seeds, reps, memory=True, profile=False, store=None, target=False):
+    """
+    All runs of one algorithm at one grid size and density: reps timed runs
+    on each of seeds grids. Returns one summary row. With profile, one extra
+    run on the first grid is profiled into results/profiles/; with store (a
+    ResultsStore), every timed run is also recorded there. With target, the
+    metaheuristics stop once within STOP_TARGET_GAP of the optimal cost.
+    """
+    params = size_params(size)
+    times, expansions, evaluations, ratios, peaks = [], [], [], [], []
+    stop_reasons = collections.Counter()
+    reached = 0
+    for seed in range(seeds):
+        grid = random_grid(size, density, seed)
+        optimal = registry.astar_cost(grid, params.START, params.GOAL)
+        for rep in range(reps):
+            result = run_once(algo, grid, params, seed * reps + rep, optimal if target else None)
+            counters = result.counters
+            if result.stop_reason is not None:
+                stop_reasons[result.stop_reason] += 1
+            times.append(counters.elapsed)
+            expansions.append(counters.expansions)
+            evaluations.append(counters.fitness_evaluations)
+            if result.reached:
+                reached += 1
+                ratios.append(result.cost / optimal if optimal > 0 else 1.0)
+            if store is not None:
+                store.add_result("matrix", f"{size}x{size} density {density} seed {seed}", result, grid)
+        if memory:
+            peaks.append(peak_memory(algo, grid, params, seed))
+        if profile and seed == 0:
+            with profile_run(algo, f"matrix_{size}x{size}_density{density}") as summary:
+                run_once(algo, grid, params, seed)
+            print(f"  {describe(summary)}")
+
+    return {
+        "algorithm": algo,
+        "size": size,
+        "density": density,
+        "runs": len(times),
+        "time_median": statistics.median(times),
+        "time_p95": float(np.percentile(times, 95)),
+        "expansions_median": statistics.median(expansions),
+        "evaluations_median": statistics.median(evaluations),
+        "peak_memory_kb": round(max(peaks) / 1024, 1) if peaks else None,
+        "reached_rate": reached / len(times),
+        "quality_ratio_median": statistics.median(ratios) if ratios else None,
+        "stop_reasons": dict(stop_reasons),
+    }
+
+
+def compare(rows, baseline_rows, tolerance):
+    """
+    Rows whose median time grew by more than tolerance (a fraction) over the
+    baseline run of the same algorithm, size and density. Returns a list of
+    (row, baseline_row, change).
+    """
+    baseline = {(b["algorithm"], b["size"], b["density"]): b for b in baseline_rows}
+    regressions = []
+    for row in rows:
+        old = baseline.get((row["algorithm"], row["size"], row["density"]))
+        if old is None or old["time_median"] <= 0:
+            continue
+        change = row["time_median"] / old["time_median"] - 1
+        if change > tolerance:
+            regressions.append((row, old, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark matrix over grid size, density and seed.")
+    parser.add_argument("--algos", nargs="+", default=registry.names(), choices=registry.names())
+    parser.add_argument("--sizes", nargs="+", type=int, default=[30, 64, 128],
+                        help="Grid sizes (30 to 4096; every cell is a Python object, so large sizes need GBs)")
+    parser.add_argument("--densities", nargs="+", type=float, default=[config.OBSTACLE_DENSITY])
+    parser.add_argument("--seeds", type=int, default=3, help="Grids per size and density")
+    parser.add_argument("--reps", type=int, default=3, help="Timed runs per grid")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced run for peak memory")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile one extra run per cell (cProfile + tracemalloc) into results/profiles/")
+    parser.add_argument("--target", action="store_true",
+                        help="Stop GA / SA / SSA once within STOP_TARGET_GAP of each grid's optimal (A*) cost")
+    parser.add_argument("--output", default=os.path.join("results", "benchmark_matrix.json"))
+    parser.add_argument("--db", help="Also record every individual run in this SQLite results store")
+    parser.add_argument("--baseline", help="Earlier output to compare median times against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed median time increase over the baseline (fraction)")
+    args = parser.parse_args()
+
+    rows = []
+    store = ResultsStore(args.db) if args.db else None
+    for size in args.sizes:
+        for density in args.densities:
+            for algo in args.algos:
+                row = run_cell(algo, size, density, args.seeds, args.reps, not args.no_memory, args.profile, store,
+                               args.target)
+                rows.append(row)
+                ratio = row["quality_ratio_median"]
+                print(f"{algo:<8} {size:>5} {density:<5} median {row['time_median']:.4f}s "
+                      f"p95 {row['time_p95']:.4f}s expansions {row['expansions_median']} "
+                      f"evals {row['evaluations_median']} reached {row['reached_rate']:.2f} "
+                      f"quality {'-' if ratio is None else round(ratio, 4)}"
+                      + (f" stops {row['stop_reasons']}" if row["stop_reasons"] else ""))
+    if store is not None:
+        store.close()
+        print(f"Runs recorded in {args.db}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                   "seeds": args.seeds, "reps": args.reps, "rows": rows}, f, indent=2)
+    print(f"{len(rows)} rows -> {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(rows, json.load(f)["rows"], args.tolerance)
+        for row, old, change in regressions:
+            print(f"REGRESSION {row['algorithm']} size {row['size']} density {row['density']}: "
+                  f"{old['time_median']:.4f}s -> {row['time_median']:.4f}s (+{change:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No median time regressions above {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
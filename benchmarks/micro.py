@@ -0,0 +1,241 @@
+import argparse
+import heapq
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import timeit
+import numpy as np
+from environment.scenarios import random_grid
+from algorithms import dijkstra
+from algorithms.batch_fitness import grid_tables, evaluate_population
+from algorithms.genome import decode_path, decode_relative
+from algorithms.repair import segment_cost
+from ui.obstacles import MovingObstacles
+from utils.metrics import path_cost, path_length, path_metrics
+
+SIZE = 64   # Fixed benchmark grid: SIZE x SIZE, seed 0
+DENSITY = 0.1
+
+
+def fixed_grid():
+    return random_grid(SIZE, DENSITY, seed=0)
+
+
+# Each setup takes a fresh fixed grid and returns the zero-argument callable to time
+
+def bench_neighbors(grid):
+    nodes = [node for row in grid.nodes for node in row]
+    return lambda: [grid.neighbors(node) for node in nodes]
+
+
+def bench_edge_cost(grid):
+    edges = [(node, nbr) for row in grid.nodes for node in row for nbr in grid.neighbors(node)]
+    return lambda: [segment_cost(a, b) for a, b in edges]
+
+
+def bench_heap_astar(grid):
+    # A* / Dijkstra pattern: (priority, node) entries pushed while expanding, popped in order
+    rng = random.Random(0)
+    entries = [(rng.random(), node) for row in grid.nodes for node in row]
+
+    def run():
+        heap = []
+        for entry in entries:
+            heapq.heappush(heap, entry)
+        while heap:
+            heapq.heappop(heap)
+    return run
+
+
+def bench_heap_adstar(grid):
+    # AD* pattern: (key, counter, node) entries with re-insertions for the same node
+    rng = random.Random(0)
+    nodes = [node for row in grid.nodes for node in row]
+    keys = [(rng.random(), nodes[rng.randrange(len(nodes))]) for _ in range(2 * len(nodes))]
+
+    def run():
+        heap = []
+        counter = itertools.count()
+        for key, node in keys:
+            heapq.heappush(heap, (key, next(counter), node))
+        while heap:
+            heapq.heappop(heap)
+    return run
+
+
+def _genomes(count, length):
+    return np.random.default_rng(0).integers(0, 4, size=(count, length), dtype=np.uint8)
+
+
+def bench_decode_absolute(grid):
+    genes = _genomes(100, 4 * SIZE).tolist()
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    decode_path(genes[0], grid, start, goal)  # Build the cached move table outside the timing
+    return lambda: [decode_path(g, grid, start, goal) for g in genes]
+
+
+def bench_decode_relative(grid):
+    genes = _genomes(100, 4 * SIZE).tolist()
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    decode_relative(genes[0], grid, start, goal)
+    return lambda: [decode_relative(g, grid, start, goal) for g in genes]
+
+
+def bench_decode_batch(grid):
+    population = _genomes(100, 4 * SIZE)
+    tables = grid_tables(grid)
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    evaluate_population(population, tables, start, goal)
+    return lambda: evaluate_population(population, tables, start, goal)
+
+
+def _optimal_path(grid):
+    path, _ = dijkstra.find_path(grid, (0, 0), (SIZE - 1, SIZE - 1))
+    return path
+
+
+def bench_path_cost(grid):
+    path = _optimal_path(grid)
+    path_cost(path, grid)
+    return lambda: path_cost(path, grid)
+
+
+def bench_path_length(grid):
+    path = _optimal_path(grid)
+    path_length(path, grid)
+    return lambda: path_length(path, grid)
+
+
+def bench_path_metrics(grid):
+    path = _optimal_path(grid)
+    path_metrics(path, grid)
+    return lambda: path_metrics(path, grid)
+
+
+def bench_update_grid(grid):
+    random.seed(0)
+    obstacles = MovingObstacles(grid, count=4)
+    return obstacles.update_grid
+
+
+BENCHMARKS = {
+    "grid.neighbors (all cells)": bench_neighbors,
+    "segment_cost (all edges)": bench_edge_cost,
+    "heap push/pop (A* pattern)": bench_heap_astar,
+    "heap push/pop (AD* pattern)": bench_heap_adstar,
+    "decode_path x100": bench_decode_absolute,
+    "decode_relative x100": bench_decode_relative,
+    "evaluate_population (100)": bench_decode_batch,
+    "path_cost": bench_path_cost,
+    "path_length": bench_path_length,
+    "path_metrics": bench_path_metrics,
+    "MovingObstacles.update_grid": bench_update_grid,
+}
+
+
+def calibration():
+    """
+    Fixed pure-Python workload (tens of milliseconds) timed with every run;
+    with --scale, comparisons divide by its speed ratio to factor out a
+    uniformly slower or faster machine.
+    """
+    total = 0
+    for i in range(500000):
+        total += i * i % 7
+    return total
+
+
+def measure(fn, repeat=7, min_time=0.05):
+    """
+    Per-call seconds of fn over repeat rounds. Each round times a loop
+    long enough to take at least min_time. Returns (median, min, stdev).
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    rounds = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return statistics.median(rounds), min(rounds), statistics.stdev(rounds) if len(rounds) > 1 else 0.0
+
+
+def run(names, repeat=7, min_time=0.05):
+    results = {"calibration": dict(zip(("median_us", "min_us", "stdev_us"),
+                                       (t * 1e6 for t in measure(calibration, repeat, min_time))))}
+    for name in names:
+        fn = BENCHMARKS[name](fixed_grid())
+        median, best, stdev = measure(fn, repeat, min_time)
+        results[name] = {"median_us": median * 1e6, "min_us": best * 1e6, "stdev_us": stdev * 1e6}
+        print(f"{name:<30} median {median * 1e6:12.2f} us  min {best * 1e6:12.2f} us  "
+              f"stdev {stdev / median if median else 0:6.1%}")
+    return results
+
+
+def noise(result, old):
+    """Relative noise of comparing two medians: the two relative stdevs combined."""
+    return ((result["stdev_us"] / result["median_us"]) ** 2 + (old["stdev_us"] / old["median_us"]) ** 2) ** 0.5
+
+
+def compare(results, baseline, tolerance, sigmas=3.0, scale=False):
+    """
+    Names whose median time grew over the baseline by more than both
+    tolerance and sigmas times the measured noise, with (change, threshold).
+    With scale, times are divided by the ratio of the two calibration runs.
+    """
+    speed = results["calibration"]["median_us"] / baseline["calibration"]["median_us"] if scale else 1.0
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if name != "calibration" and old and old["median_us"] > 0:
+            change = result["median_us"] / (old["median_us"] * speed) - 1
+            threshold = max(tolerance, sigmas * noise(result, old))
+            if change > threshold:
+                regressions.append((name, change, threshold))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the hot primitives on a fixed seeded grid.")
+    parser.add_argument("--filter", default="", help="Only benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed rounds per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    parser.add_argument("--save", metavar="FILE", help="Store the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed increase of the median time over the baseline (fraction)")
+    parser.add_argument("--sigmas", type=float, default=3.0,
+                        help="Also allow this many combined standard deviations of noise")
+    parser.add_argument("--scale", action="store_true",
+                        help="Divide times by the calibration speed ratio (baseline from another machine)")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter.lower() in name.lower()]
+    results = run(names, args.repeat, args.min_time)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline -> {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.sigmas, args.scale)
+        if regressions:
+            # Re-measure suspects once: only a slowdown seen twice counts
+            suspects = [name for name, _, _ in regressions]
+            print(f"Re-measuring {len(suspects)} suspect(s)")
+            rerun = run(suspects, args.repeat, args.min_time)
+            regressions = compare(rerun, baseline, args.tolerance, args.sigmas, args.scale)
+        for name, change, threshold in regressions:
+            print(f"REGRESSION {name}: +{change:.0%} (threshold {threshold:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.tolerance:.0%} / {args.sigmas:g} sigma")
+
+
+if __name__ == "__main__":
+    main()
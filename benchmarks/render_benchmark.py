@@ -0,0 +1,178 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window; must be set before pygame is imported
+import argparse
+import json
+import random
+import statistics
+import time
+import warnings
+import pygame
+from environment.scenarios import random_grid
+from algorithms import registry
+from ui import dynamic_vis, pygame_vis
+from ui.buttons import Button
+from ui.obstacles import MovingObstacles
+
+SECTIONS = ("grid", "path", "legend", "buttons", "flip", "capture")
+CONTROLS = ("Reset Grid", "Show Matplotlib", "Exit Simulation", "Start Recording", "Screenshot")
+
+
+def snake_path(size, length):
+    """length cells of a boustrophedon walk from (0, 0), a stand-in for a planned path."""
+    path = []
+    for y in range(size):
+        xs = range(size) if y % 2 == 0 else range(size - 1, -1, -1)
+        for x in xs:
+            if len(path) == length:
+                return path
+            path.append((x, y))
+    return path
+
+
+class DynamicScene:
+    """One frame of ui.dynamic_vis, split into its drawing steps."""
+
+    def __init__(self, grid, path):
+        self.grid = grid
+        self.path = path
+        self.grid_area_width = grid.width * (dynamic_vis.CELL_SIZE + dynamic_vis.MARGIN)
+        self.grid_area_height = grid.height * (dynamic_vis.CELL_SIZE + dynamic_vis.MARGIN)
+        width = self.grid_area_width + dynamic_vis.PANEL_WIDTH + dynamic_vis.GRID_MARGIN
+        self.height = self.grid_area_height + 250
+        self.screen = pygame.display.set_mode((width, self.height))
+        self.font = pygame.font.SysFont(None, 24)
+        self.fonts = (pygame.font.SysFont(None, 28, bold=True), pygame.font.SysFont(None, 20))
+        self.sidebar_x = self.grid_area_width + dynamic_vis.GRID_MARGIN
+        self.metrics = {"time": 0.0123, "length": 58.0, "cost": 67.73, "ops": 123456.0}
+        y = self.grid_area_height + 20
+        self.buttons = ([Button(name, 20 + i * 160, y, 150, 40, (200, 200, 200), (170, 170, 170))
+                         for i, name in enumerate(registry.names())] +
+                        [Button(name, 20 + i * 160, y + 50, 150, 40, (100, 149, 237), (65, 105, 225))
+                         for i, name in enumerate(CONTROLS)])
+
+    def grid_step(self):
+        self.screen.fill(dynamic_vis.BACKGROUND_COLOR)
+        dynamic_vis.draw_grid(self.screen, self.grid, (0, 0), (self.grid.width - 1, self.grid.height - 1))
+
+    def path_step(self):
+        dynamic_vis.draw_path(self.screen, self.path, len(self.path), dynamic_vis.COLORS["AD*"])
+
+    def legend_step(self):
+        dynamic_vis.draw_legend(self.screen, self.fonts, self.sidebar_x, self.grid_area_width,
+                                self.grid_area_height)
+        dynamic_vis.draw_info(self.screen, self.font, self.height - 90, "AD*", self.metrics, True)
+
+    def buttons_step(self):
+        dynamic_vis.draw_buttons(self.screen, self.buttons, self.font, "AD*", True)
+
+    def capture_step(self):
+        dynamic_vis.capture_frame(self.screen)
+
+
+class ClassicScene:
+    """One frame of ui.pygame_vis (which has no recorder, so capture is skipped)."""
+
+    def __init__(self, grid, path):
+        self.grid = grid
+        self.path = path
+        self.w = grid.width * pygame_vis.CELL + (grid.width + 1) * pygame_vis.MARGIN
+        h = grid.height * pygame_vis.CELL + (grid.height + 1) * pygame_vis.MARGIN + 100
+        self.screen = pygame.display.set_mode((self.w + 140, h))
+        self.font = pygame.font.SysFont(None, 24)
+        self.font_small = pygame.font.SysFont(None, 18)
+        self.buttons = [pygame_vis.Button(name, 10 + i * 130, h - 60, 120, 40, (200, 200, 200), (170, 170, 170))
+                        for i, name in enumerate(pygame_vis.COLORS)]
+
+    def grid_step(self):
+        self.screen.fill(pygame_vis.BACKGROUND_COLOR)
+        pygame_vis.draw_grid(self.screen, self.grid, (0, 0), (self.grid.width - 1, self.grid.height - 1))
+
+    def path_step(self):
+        pygame_vis.draw_path(self.screen, self.path, len(self.path), pygame_vis.COLORS["AD*"])
+
+    def legend_step(self):
+        pygame_vis.draw_legend(self.screen, self.font_small, self.w, self.grid)
+
+    def buttons_step(self):
+        for btn in self.buttons:
+            btn.draw(self.screen, self.font)
+
+    capture_step = None
+
+
+SCENES = {"dynamic": DynamicScene, "classic": ClassicScene}
+
+
+def measure(scene, frames):
+    """Median milliseconds per frame for each section, plus the frame total."""
+    steps = {
+        "grid": scene.grid_step,
+        "path": scene.path_step,
+        "legend": scene.legend_step,
+        "buttons": scene.buttons_step,
+        "flip": pygame.display.flip,
+        "capture": scene.capture_step,
+    }
+    samples = {name: [] for name in SECTIONS}
+    totals = []
+    for _ in range(frames):
+        frame_start = time.perf_counter_ns()
+        for name in SECTIONS:
+            step = steps[name]
+            if step is None:
+                continue
+            t0 = time.perf_counter_ns()
+            step()
+            samples[name].append(time.perf_counter_ns() - t0)
+        totals.append(time.perf_counter_ns() - frame_start)
+    result = {f"{name}_ms": statistics.median(values) / 1e6 if values else None for name, values in samples.items()}
+    result["frame_ms"] = statistics.median(totals) / 1e6
+    return result
+
+
+def run(visualizer, size, path_fraction, obstacle_count, frames, density=0.1):
+    grid = random_grid(size, density, seed=0)
+    random.seed(0)
+    MovingObstacles(grid, count=obstacle_count)
+    path = snake_path(size, int(size * size * path_fraction))
+    scene = SCENES[visualizer](grid, path)
+    measure(scene, 2)  # Warm up glyph caches
+    row = {"visualizer": visualizer, "size": size, "path_cells": len(path), "obstacles": obstacle_count}
+    row.update(measure(scene, frames))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame render cost of the pygame visualizers (SDL dummy driver).")
+    parser.add_argument("--visualizers", nargs="+", default=list(SCENES), choices=list(SCENES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[30, 60, 120])
+    parser.add_argument("--path-fractions", nargs="+", type=float, default=[0.1, 0.5],
+                        help="Path length as a fraction of the grid's cells")
+    parser.add_argument("--obstacles", nargs="+", type=int, default=[4, 64], help="Moving obstacle counts")
+    parser.add_argument("--frames", type=int, default=30, help="Timed frames per setting")
+    parser.add_argument("--output", default=os.path.join("results", "render_benchmark.json"))
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", module="pygame.sysfont")  # No fc-list in minimal containers
+    pygame.init()
+    rows = []
+    for visualizer in args.visualizers:
+        for size in args.sizes:
+            for fraction in args.path_fractions:
+                for count in args.obstacles:
+                    row = run(visualizer, size, fraction, count, args.frames)
+                    rows.append(row)
+                    parts = ", ".join(f"{name} {row[f'{name}_ms']:.3f}" for name in SECTIONS
+                                      if row[f"{name}_ms"] is not None)
+                    print(f"{visualizer:<8} {size:>4}x{size:<4} path {row['path_cells']:>6} obstacles {count:>3}: "
+                          f"frame {row['frame_ms']:.3f} ms ({parts})")
+    pygame.quit()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(rows, f, indent=2)
+    print(f"{len(rows)} settings -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
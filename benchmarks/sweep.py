@@ -0,0 +1,216 @@
+import argparse
+import ast
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+import config
+from environment.scenarios import load_scenarios, make_scenarios, save_scenarios, scenario_info
+from algorithms import registry, simulated_annealing
+
+# Used when no --param is given
+DEFAULT_SPACES = {
+    "GA": {"POPULATION_SIZE": [30, 50, 80], "MUTATION_RATE": [0.01, 0.02, 0.05]},
+    "SA": {"TEMPERATURE": [50.0, 100.0, 200.0], "COOLING_RATE": [0.99, 0.995, 0.998]},
+    "SSA": {"SSA_POP_SIZE": [50, 100, 150], "MAX_STEPS_SSA": [120, 240]},
+}
+
+
+def full_budget(algo, params):
+    """Fitness evaluations a complete run of algo spends under params."""
+    if algo == "GA":
+        return params.GENERATIONS * params.POPULATION_SIZE * max(1, params.GA_ISLANDS)
+    if algo == "SA":
+        return simulated_annealing.schedule_length(params) * max(1, params.SA_CHAINS)
+    return params.SSA_ITERATIONS * params.SSA_POP_SIZE
+
+
+def grid_search(space):
+    """Every combination of a {name: [values]} space."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_search(space, count, seed=0):
+    """
+    count random configurations. A list is sampled uniformly; a (low, high)
+    tuple is a range, integer if both ends are integers, else uniform float.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(count):
+        values = {}
+        for name, choices in space.items():
+            if isinstance(choices, tuple):
+                low, high = choices
+                values[name] = (rng.randint(low, high) if isinstance(low, int) and isinstance(high, int)
+                                else rng.uniform(low, high))
+            else:
+                values[name] = rng.choice(choices)
+        configs.append(values)
+    return configs
+
+
+_scenarios = {}  # Scenario file -> grids, loaded once per worker process
+
+
+def run_trial(trial):
+    """
+    One run of algo on one saved scenario with per-run settings, cut off at
+    the given fraction of its full evaluation budget. Runs in a pool worker.
+    """
+    algo, overrides, scenario_file, scenario, seed, fraction = trial
+    if scenario_file not in _scenarios:
+        _scenarios[scenario_file] = load_scenarios(scenario_file)
+    grid = _scenarios[scenario_file][scenario]
+
+    params = config.snapshot(**overrides)
+    if fraction < 1:
+        params.STOP_MAX_EVALUATIONS = max(1, int(full_budget(algo, params) * fraction))
+
+    random.seed(seed)  # SA draws from the random module
+    t0 = time.perf_counter()
+    kwargs = {} if algo == "SA" else {"seed": seed}
+    result = registry.plan(algo, grid, params=params, **kwargs)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "score": min(result.history) if result.history else float('inf'),
+        "cost": result.cost if result.reached else float('inf'),
+        "reached": result.reached,
+        "evaluations": result.work_units,
+        "time": elapsed,
+    }
+
+
+def successive_halving(algo, configs, scenario_file, scenarios, eta=3, min_fraction=None, workers=None, seed=0):
+    """
+    Run every configuration on every scenario with a small budget, keep the
+    best 1/eta by mean best-so-far cost of the partial convergence histories,
+    multiply the budget by eta and repeat until one configuration is left or
+    the full budget is reached. Returns one row per configuration per rung.
+    """
+    if min_fraction is None:
+        rungs = int(math.log(len(configs), eta)) if len(configs) > 1 else 0
+        min_fraction = eta ** -rungs
+
+    rows = []
+    alive = list(range(len(configs)))
+    fraction = min_fraction
+    rung = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            trials = [(algo, configs[c], scenario_file, s, seed + s, fraction)
+                      for c in alive for s in range(scenarios)]
+            results = list(pool.map(run_trial, trials))
+
+            scores = {}
+            for i, c in enumerate(alive):
+                runs = results[i * scenarios:(i + 1) * scenarios]
+                scores[c] = statistics.mean(r["score"] for r in runs)
+                reached = [r["cost"] for r in runs if r["reached"]]
+                rows.append({
+                    "Rung": rung,
+                    "Budget Fraction": round(fraction, 4),
+                    "Config": c,
+                    "Params": json.dumps(configs[c], sort_keys=True),
+                    "Mean Score": round(scores[c], 4),
+                    "Mean Cost (feasible)": round(statistics.mean(reached), 4) if reached else None,
+                    "Feasible Rate": round(len(reached) / scenarios, 4),
+                    "Mean Evaluations": statistics.mean(r["evaluations"] for r in runs),
+                    "Mean Time (s)": round(statistics.mean(r["time"] for r in runs), 4),
+                })
+
+            if fraction >= 1 or len(alive) <= 1:
+                break
+            alive = sorted(alive, key=scores.get)[:max(1, len(alive) // eta)]
+            fraction = min(1.0, fraction * eta)
+            rung += 1
+    return rows
+
+
+def parse_space(specs):
+    """--param NAME=v1,v2,... (values) or NAME=low:high (range, random search only)."""
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if ":" in values:
+            low, high = values.split(":")
+            space[name] = (ast.literal_eval(low), ast.literal_eval(high))
+        else:
+            space[name] = [ast.literal_eval(v) for v in values.split(",")]
+    config.snapshot(**{name: None for name in space})  # Fails early on unknown names
+    return space
+
+
+def scenario_mismatch(info, count, seed, density):
+    """Why a saved scenario file cannot serve this sweep (a message), or None if it can."""
+    if info["seed"] is None or info["density"] is None:
+        return "it records no seed / density"
+    if info["seed"] != seed or not math.isclose(info["density"], density):
+        return f"it was made with seed {info['seed']}, density {info['density']}"
+    if (info["width"], info["height"]) != (config.GRID_WIDTH, config.GRID_HEIGHT):
+        return f"its grids are {info['width']}x{info['height']}"
+    if info["count"] < count:
+        return f"it holds only {info['count']} scenarios"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep with successive-halving pruning.")
+    parser.add_argument("algo", choices=registry.names("metaheuristic"))
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUES",
+                        help="Search dimension, e.g. MUTATION_RATE=0.01,0.02 or MUTATION_RATE=0.005:0.1")
+    parser.add_argument("--random", type=int, metavar="N", help="Sample N random configurations instead of a grid")
+    parser.add_argument("--scenarios", type=int, default=5, help="Scenario grids per configuration")
+    parser.add_argument("--scenario-file", default=os.path.join("results", "sweep_scenarios.npz"),
+                        help="Reused if it matches --seed, --density and the grid size, regenerated otherwise")
+    parser.add_argument("--density", type=float, default=None,
+                        help="Obstacle density of the scenarios (default config.OBSTACLE_DENSITY)")
+    parser.add_argument("--eta", type=int, default=3, help="Keep 1/eta of the configurations per rung")
+    parser.add_argument("--min-fraction", type=float, default=None, help="Budget fraction of the first rung")
+    parser.add_argument("--workers", type=int, default=None, help="Pool size (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="CSV file (default results/sweep_<algo>.csv)")
+    args = parser.parse_args()
+
+    space = parse_space(args.param) if args.param else DEFAULT_SPACES[args.algo]
+    if args.random:
+        configs = random_search(space, args.random, args.seed)
+    elif any(isinstance(v, tuple) for v in space.values()):
+        parser.error("ranges (low:high) need --random")
+    else:
+        configs = grid_search(space)
+
+    density = config.OBSTACLE_DENSITY if args.density is None else args.density
+    stale = None
+    if os.path.exists(args.scenario_file):
+        stale = scenario_mismatch(scenario_info(args.scenario_file), args.scenarios, args.seed, density)
+        if stale:
+            print(f"Regenerating {args.scenario_file}: {stale}")
+    if stale or not os.path.exists(args.scenario_file):
+        os.makedirs(os.path.dirname(args.scenario_file) or ".", exist_ok=True)
+        save_scenarios(args.scenario_file, make_scenarios(args.scenarios, args.seed, density), args.seed, density)
+
+    rows = successive_halving(args.algo, configs, args.scenario_file, args.scenarios, args.eta,
+                              args.min_fraction, args.workers, args.seed)
+
+    output = args.output or os.path.join("results", f"sweep_{args.algo.lower()}.csv")
+    with open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    final = [row for row in rows if row["Rung"] == rows[-1]["Rung"]]
+    best = min(final, key=lambda row: row["Mean Score"])
+    print(f"{len(configs)} configurations, {rows[-1]['Rung'] + 1} rungs -> {output}")
+    print(f"Best: {best['Params']} (mean score {best['Mean Score']}, feasible rate {best['Feasible Rate']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # Global configuration and hyperparameters
+import types
 
 GRID_WIDTH = 30
 GRID_HEIGHT = 30
@@ -14,14 +15,57 @@ MAX_STEPS_GA = (GRID_WIDTH + GRID_HEIGHT) * 2  # 120
 POPULATION_SIZE = 50
 GENERATIONS = 100
 MUTATION_RATE = 0.02
+GA_ISLANDS = 1              # >1 runs one GA population per worker process (island model)
+GA_MIGRATION_INTERVAL = 10  # Generations between migrations
+GA_MIGRANTS = 2             # Best individuals sent to the neighbouring island per migration
 
 # Simulated Annealing params
 MAX_STEPS_SA = (GRID_WIDTH + GRID_HEIGHT) * 4  # 120
 TEMPERATURE = 100.0
 COOLING_RATE = 0.995
 MIN_TEMPERATURE = 0.1
+SA_CHAINS = 1               # >1 runs parallel tempering with one replica per worker process
+SA_SWAP_INTERVAL = 50       # Iterations between replica-exchange attempts
+SA_REHEAT = 0.1             # Resumed runs restart at least at TEMPERATURE * SA_REHEAT
 
 # Sparrow Search Algorithm params
 SSA_POP_SIZE = 100
 SSA_ITERATIONS = 200
-MAX_STEPS_SSA = (GRID_WIDTH + GRID_HEIGHT) * 4  # 240
\ No newline at end of file
+MAX_STEPS_SSA = (GRID_WIDTH + GRID_HEIGHT) * 4  # 240
+
+# Local path repair (dynamic scenes)
+REPAIR_MAX_EXPANSIONS = 400  # Search budget per detour before falling back to a full replan
+
+# Goal penalty for GA / SA / SSA paths that stop short of the goal
+PENALTY_MODE = "euclidean"  # "euclidean" (straight line) or "cost_to_go" (reverse Dijkstra around walls and terrain)
+
+# Genome encoding for GA / SSA (SA always uses absolute directions)
+GENOME_ENCODING = "absolute"  # "absolute" (gene = direction) or "relative" (gene picks one of the valid neighbours)
+GENOME_REPAIR = True          # Relative encoding: cut loops and dead ends out of new genomes
+
+# Fitness memoization (GA / SSA)
+FITNESS_CACHE_SIZE = 20000  # Max cached genome scores before least-recently-used entries are evicted
+
+# Early stopping for GA / SA / SSA (None disables a rule)
+STOP_STALL_WINDOW = None     # Generations / iterations without improvement before stopping
+STOP_TARGET_GAP = 0.05       # Stop within this fraction of a known target cost (e.g. A*), when one is given
+STOP_MAX_EVALUATIONS = None  # Fitness evaluation budget
+STOP_TIME_LIMIT = None       # Wall-clock budget in seconds
+
+# Warm start for GA / SA / SSA from a greedy best-first path
+WARM_START = False
+WARM_START_FRACTION = 0.2       # Share of a population seeded from the greedy path
+WARM_START_PERTURBATION = 0.05  # Per-gene re-draw probability for seeded copies (row 0 stays exact)
+
+
+def snapshot(**overrides):
+    """
+    Per-run copy of the settings above, with overrides applied, for passing as
+    params= to the algorithms instead of changing this module's globals.
+    """
+    values = {name: value for name, value in globals().items() if name.isupper()}
+    unknown = set(overrides) - set(values)
+    if unknown:
+        raise KeyError(f"Unknown config setting(s): {', '.join(sorted(unknown))}")
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
@@ -1,16 +1,55 @@
 import random
+import itertools
 from environment.node import Node
 from environment.map_loader import load_heightmap
 import config
 
+# Shared across grids so a version number never repeats, even for a new Grid
+_versions = itertools.count()
+
 class Grid:
-    def __init__(self):
+    def __init__(self, density=None):
         self.width = config.GRID_WIDTH
         self.height = config.GRID_HEIGHT
         self.nodes = [[None for _ in range(self.width)] for _ in range(self.height)]
-        self._generate()
+        self.version = next(_versions)
+        self._derived = {}
+        self._derived_version = self.version
+        self._generate(config.OBSTACLE_DENSITY if density is None else density)
+
+    @classmethod
+    def from_arrays(cls, heights, obstacles):
+        """Rebuild a grid from to_arrays() output (e.g. a saved scenario)."""
+        grid = cls.__new__(cls)
+        grid.height = len(heights)
+        grid.width = len(heights[0])
+        grid.nodes = [[Node(x, y, float(heights[y][x]), bool(obstacles[y][x]), bool(obstacles[y][x]))
+                       for x in range(grid.width)] for y in range(grid.height)]
+        grid.version = next(_versions)
+        grid._derived = {}
+        grid._derived_version = grid.version
+        return grid
+
+    def to_arrays(self):
+        """(heights, obstacles) as nested lists, row-major like nodes."""
+        heights = [[node.height for node in row] for row in self.nodes]
+        obstacles = [[node.is_obstacle for node in row] for row in self.nodes]
+        return heights, obstacles
+
+    def touch(self):
+        """Mark the grid as changed so data cached against the old layout is dropped."""
+        self.version = next(_versions)
+
+    def cached(self, key, build):
+        """Return build(grid) for the current layout, rebuilding it after the grid changes."""
+        if self._derived_version != self.version:
+            self._derived = {}
+            self._derived_version = self.version
+        if key not in self._derived:
+            self._derived[key] = build(self)
+        return self._derived[key]
 
-    def _generate(self):
+    def _generate(self, density):
         # Load heights
         if config.USE_HEIGHT_MAP:
             heights = load_heightmap()
@@ -22,7 +61,7 @@ class Grid:
             for x in range(self.width):
                 h = heights[y][x]
                 is_obs = (
-                    random.random() < config.OBSTACLE_DENSITY
+                    random.random() < density
                     and (x, y) not in (config.START, config.GOAL) # Never place obstacle on start or goal  
                 )
                 self.nodes[y][x] = Node(x, y, h, is_obs, is_obs)
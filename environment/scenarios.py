@@ -0,0 +1,66 @@
+import random
+import numpy as np
+import config
+from environment.grid import Grid
+
+
+def make_scenarios(count, seed=0, density=None):
+    """count reproducible random grids (scenario i is generated from seed + i)."""
+    saved = random.getstate()
+    try:
+        grids = []
+        for i in range(count):
+            random.seed(seed + i)
+            grids.append(Grid(density))
+        return grids
+    finally:
+        random.setstate(saved)
+
+
+def random_grid(size, density=None, seed=0):
+    """
+    size x size grid with uniform random heights and obstacles, start (0, 0)
+    and goal (size - 1, size - 1) kept free and flat. Unlike Grid() it does
+    not depend on GRID_WIDTH / GRID_HEIGHT, so any size can be built.
+    """
+    if density is None:
+        density = config.OBSTACLE_DENSITY
+    rng = np.random.default_rng(seed)
+    heights = rng.random((size, size))
+    obstacles = rng.random((size, size)) < density
+    for x, y in ((0, 0), (size - 1, size - 1)):
+        heights[y, x] = 0.0
+        obstacles[y, x] = False
+    return Grid.from_arrays(heights.tolist(), obstacles.tolist())
+
+
+def save_scenarios(path, grids, seed=None, density=None):
+    """
+    Store grids of equal size in one .npz file (heights and obstacle masks),
+    with the make_scenarios seed and density they came from, if given.
+    """
+    arrays = [grid.to_arrays() for grid in grids]
+    np.savez_compressed(path,
+                        heights=np.array([heights for heights, _ in arrays], dtype=np.float64),
+                        obstacles=np.array([obstacles for _, obstacles in arrays], dtype=bool),
+                        seed=np.array(np.nan if seed is None else seed, dtype=np.float64),
+                        density=np.array(np.nan if density is None else density, dtype=np.float64))
+
+
+def scenario_info(path):
+    """
+    count, width, height, seed and density of a scenario file; seed and
+    density are None when unknown (files saved without them).
+    """
+    with np.load(path) as data:
+        count, height, width = data["heights"].shape
+        meta = {key: float(data[key]) if key in data.files and not np.isnan(data[key]) else None
+                for key in ("seed", "density")}
+    seed = None if meta["seed"] is None else int(meta["seed"])
+    return {"count": count, "width": width, "height": height, "seed": seed, "density": meta["density"]}
+
+
+def load_scenarios(path):
+    with np.load(path) as data:
+        return [Grid.from_arrays(heights.tolist(), obstacles.tolist())
+                for heights, obstacles in zip(data["heights"], data["obstacles"])]
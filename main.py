@@ -1,108 +1,129 @@
 import argparse
-import time
-import os
 import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from config import START, GOAL
 from environment.grid import Grid
-from algorithms import astar, adstar, dijkstra, genetic, simulated_annealing
-from utils.metrics import path_cost
-from utils.logger import log_results_csv, log_convergence_csv
-from ui import pygame_vis, matplotlib_vis
-from utils.logger import plot_performance_metrics, plot_convergence
+from algorithms import registry
+from algorithms.fitness_cache import FitnessCache
+from utils.profiling import describe, profile_run
+from utils.logger import log_results_csv
+from utils.results_store import ResultsStore
+
+# pygame, pandas and matplotlib are only imported when plotting or visualizing
+CACHED = ("GA", "SSA")  # Metaheuristics that take a FitnessCache
 
-def run_all():
-    grid = Grid()
-    results = {}
-    metrics = []
 
-    # Run A*
-    start_time = time.time()
-    path_astar = astar.find_path(copy.deepcopy(grid), START, GOAL)
-    time_astar = time.time() - start_time
-    cost_astar = path_cost(path_astar, grid) if path_astar else float('inf')
-    reached_astar = path_astar and path_astar[-1] == GOAL
-    metrics.append({
-        "Algorithm": "A*",
-        "Time (s)": round(time_astar, 4),
-        "Path Length": len(path_astar),
-        "Path Cost": round(cost_astar, 2),
-        "Reached Goal": "Yes" if reached_astar else "No"
-    })
-    results["A*"] = path_astar
-    
-    # Run AD*
-    start_time = time.time()
-    path_adstar = adstar.find_path(copy.deepcopy(grid), START, GOAL)
-    time_adstar = time.time() - start_time
-    cost_adstar = path_adstar and path_cost(path_adstar, grid) or float('inf')
-    reached_adstar = path_adstar and path_adstar[-1] == GOAL
-    metrics.append({
-        "Algorithm": "AD*",
-        "Time (s)": round(time_adstar, 4),
-        "Path Length": len(path_adstar),
-        "Path Cost": round(cost_adstar, 2),
-        "Reached Goal": "Yes" if reached_adstar else "No"
-    })
-    results["AD*"] = path_adstar
+def run_algorithm(name, grid, profile=False, target_cost=None, scenario="run_all"):
+    """
+    Run one algorithm on grid. Returns (PlanResult, hit_rates, row), where
+    row is the performance_metrics.csv row and hit_rates the per-iteration
+    fitness cache hit rates (None without a cache). target_cost (e.g. the
+    A* cost) lets the metaheuristics stop within STOP_TARGET_GAP of it.
+    With profile, one extra untimed run on a copy of grid is profiled into
+    results/profiles/ under scenario.
+    """
+    profiled_grid = copy.deepcopy(grid) if profile else None
+    cache = FitnessCache() if name in CACHED else None
+    kwargs = {"cache": cache} if cache is not None else {}
+    result = registry.plan(name, grid, START, GOAL, target_cost=target_cost, **kwargs)
+    if profile:
+        # Profiled separately: the profiler would inflate the logged time
+        kwargs = {"cache": FitnessCache()} if cache is not None else {}
+        with profile_run(name, scenario) as summary:
+            registry.plan(name, profiled_grid, START, GOAL, target_cost=target_cost, **kwargs)
+        print(f"  {describe(summary)}")
+    row = {
+        "Algorithm": name,
+        "Time (s)": round(result.elapsed, 4),
+        "Path Length": len(result.path),
+        "Path Cost": round(result.cost, 2),
+        "Reached Goal": "Yes" if result.reached else "No"
+    }
+    return result, cache.history if cache is not None else None, row
 
-    # Run Dijkstra
-    start_time = time.time()
-    path_dijkstra = dijkstra.find_path(copy.deepcopy(grid), START, GOAL)
-    time_dijkstra = time.time() - start_time
-    cost_dijkstra = path_cost(path_dijkstra, grid) if path_dijkstra else float('inf')
-    reached_dijkstra = path_dijkstra and path_dijkstra[-1] == GOAL
-    metrics.append({
-        "Algorithm": "Dijkstra",
-        "Time (s)": round(time_dijkstra, 4),
-        "Path Length": len(path_dijkstra),
-        "Path Cost": round(cost_dijkstra, 2),
-        "Reached Goal": "Yes" if reached_dijkstra else "No"
-    })
-    results["Dijkstra"] = path_dijkstra
 
-    # Run GA
-    start_time = time.time()
-    path_ga, history_ga = genetic.find_path(copy.deepcopy(grid), START, GOAL)
-    time_ga = time.time() - start_time
-    cost_ga = path_cost(path_ga, grid) if path_ga else float('inf')
-    reached_ga = path_ga and path_ga[-1] == GOAL
-    metrics.append({
-        "Algorithm": "GA",
-        "Time (s)": round(time_ga, 4),
-        "Path Length": len(path_ga),
-        "Path Cost": round(cost_ga, 2),
-        "Reached Goal": "Yes" if reached_ga else "No"
-    })
-    results["GA"] = path_ga
-    log_convergence_csv("results/ga_convergence.csv", history_ga, "GA")
+def _run_from_arrays(name, heights, obstacles, profile, target_cost, scenario):
+    return run_algorithm(name, Grid.from_arrays(heights, obstacles), profile, target_cost, scenario)
+
+
+def run_headless(grid, algorithms=tuple(registry.PLANNERS), workers=None, profile=False, target_cost=None,
+                 scenario="run_all"):
+    """
+    Run algorithms on grid and yield each run_algorithm result as it finishes.
+    Runs go to a process pool of workers processes (one per algorithm by
+    default); with workers=1 they run one after another in this process.
+    """
+    if workers == 1:
+        for name in algorithms:
+            yield run_algorithm(name, copy.deepcopy(grid), profile, target_cost, scenario)
+        return
+
+    heights, obstacles = grid.to_arrays()
+    with ProcessPoolExecutor(max_workers=workers or len(algorithms)) as pool:
+        futures = [pool.submit(_run_from_arrays, name, heights, obstacles, profile, target_cost, scenario)
+                   for name in algorithms]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_all(profile=False, algorithms=tuple(registry.PLANNERS), workers=None, plot=True, visualize=True,
+            target=False):
+    """
+    Run algorithms on one grid, record the results and optionally plot and
+    visualize them. With profile, each algorithm also gets an extra, untimed
+    profiled run in results/profiles/, named after the grid size and the
+    start time so later calls do not overwrite it; with target, the metaheuristics stop once within STOP_TARGET_GAP of the
+    grid's A* cost.
+    """
+    grid = Grid()
+    results = {}
+    metrics = []
+    target_cost = registry.astar_cost(grid, START, GOAL) if target else None
+    scenario = f"run_all_{grid.width}x{grid.height}_{time.strftime('%Y%m%d_%H%M%S')}"
 
-    # Run SA
-    start_time = time.time()
-    path_sa, history_sa = simulated_annealing.find_path(copy.deepcopy(grid), START, GOAL)
-    time_sa = time.time() - start_time
-    cost_sa = path_cost(path_sa, grid) if path_sa else float('inf')
-    reached_sa = path_sa and path_sa[-1] == GOAL
-    metrics.append({
-        "Algorithm": "SA",
-        "Time (s)": round(time_sa, 4),
-        "Path Length": len(path_sa),
-        "Path Cost": round(cost_sa, 2),
-        "Reached Goal": "Yes" if reached_sa else "No"
-    })
-    results["SA"] = path_sa
-    log_convergence_csv("results/sa_convergence.csv", history_sa, "SA")
+    # Stream each run into the store as soon as it finishes
+    with ResultsStore() as store:
+        for result, hit_rates, row in run_headless(grid, algorithms, workers, profile, target_cost, scenario):
+            name = result.algorithm
+            stopped = f" stopped by {result.stop_reason}" if result.stop_reason else ""
+            print(f"{name:<8} time {row['Time (s)']}s length {row['Path Length']} cost {row['Path Cost']} "
+                  f"reached {row['Reached Goal']}{stopped}")
+            results[name] = result.path
+            metrics.append(row)
+            run_id = store.add_result("run_all", f"{grid.width}x{grid.height}", result, grid)
+            if result.history:
+                store.add_convergence(run_id, result.history, hit_rates)
 
-    # Save summary metrics to CSV
-    log_results_csv("results/performance_metrics.csv", metrics)
+    # Save summary metrics to CSV, in the requested algorithm order
+    metrics.sort(key=lambda row: algorithms.index(row["Algorithm"]))
+    log_results_csv(os.path.join("results", "performance_metrics.csv"), metrics)
 
-    plot_performance_metrics()
-    plot_convergence()
+    if plot:
+        from utils.logger import plot_performance_metrics, plot_convergence
+        plot_performance_metrics()
+        plot_convergence()
 
     # Visualize
-    run_game = pygame_vis.display_multiple(grid, results)
-    if run_game == "run_matplotlib":
-        matplotlib_vis.animate_multiple(grid, results)
+    if visualize:
+        from ui import pygame_vis, matplotlib_vis
+        results = {name: results[name] for name in algorithms}
+        run_game = pygame_vis.display_multiple(grid, results)
+        if run_game == "run_matplotlib":
+            matplotlib_vis.animate_multiple(grid, results)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every algorithm on one grid and visualize the paths.")
+    parser.add_argument("--algos", nargs="+", default=registry.names(), choices=registry.names())
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per algorithm; 1 runs in-process)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Only run and record the algorithms: no plots, no pygame window")
+    parser.add_argument("--target", action="store_true",
+                        help="Stop GA / SA / SSA once within STOP_TARGET_GAP of the grid's A* cost")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile one extra, untimed run per algorithm (cProfile + tracemalloc) into results/profiles/")
+    args = parser.parse_args()
     # main()
-    run_all()
+    run_all(profile=args.profile, algorithms=tuple(args.algos), workers=args.workers,
+            plot=not args.headless, visualize=not args.headless, target=args.target)
@@ -7,12 +7,12 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from ui.buttons import Button
 from ui.obstacles import MovingObstacles
-from utils.path_utils import normalize_path
-from utils.logger import log_results_csv, log_convergence_csv, log_computing_power
-from utils.metrics import path_cost, path_length
+from utils.results_store import ResultsStore
+from utils.metrics import path_metrics
 from environment.grid import Grid
 from config import START, GOAL, OBSTACLE_COUNT
-from algorithms import astar, dijkstra, adstar, genetic, simulated_annealing, ssa
+from algorithms import registry
+from algorithms.replanning import Replanner, repair_or_replan
 
 # ==== SETTINGS ====
 CELL_SIZE = 20
@@ -45,6 +45,103 @@ performance_data = []
 if not os.path.exists(RESULTS_DIR):
     os.makedirs(RESULTS_DIR)
 
+def cell_rect(x, y):
+    return pygame.Rect(MARGIN + x * (CELL_SIZE + MARGIN), MARGIN + y * (CELL_SIZE + MARGIN), CELL_SIZE, CELL_SIZE)
+
+
+def draw_grid(screen, grid, start=START, goal=GOAL):
+    for y in range(grid.height):
+        for x in range(grid.width):
+            node = grid.get_node(x, y)
+
+            # Drawing logic
+            if (node.x, node.y) == start:
+                color = COLOR_START
+            elif (node.x, node.y) == goal:
+                color = COLOR_GOAL
+            elif node.is_obstacle:
+                color = COLOR_STATIC_OBS if node.is_static_obs else COLOR_MOVING_OBS
+            else:
+                shade = int(255 * (1 - node.height))  # Scale height to grayscale
+                color = (shade, shade, shade)
+
+            pygame.draw.rect(screen, color, cell_rect(x, y))
+
+
+def draw_path(screen, path, steps, color):
+    """First steps cells of path."""
+    for px, py in path[:steps]:
+        pygame.draw.rect(screen, color, cell_rect(px, py))
+
+
+def draw_legend(screen, fonts, sidebar_x, grid_area_width, grid_area_height, start=START, goal=GOAL):
+    """Sidebar: height legend, start / goal and obstacle colours."""
+    font_heading, font_small = fonts
+    pygame.draw.rect(screen, (230, 230, 230), (grid_area_width + GRID_MARGIN, 0, PANEL_WIDTH, grid_area_height))
+
+    # Title
+    legend_title = font_heading.render("Legend & Info", True, (0, 0, 0))
+    screen.blit(legend_title, (sidebar_x, 30))
+
+    # Height gradient
+    legend_y = 80
+    legend_height = 250
+    for i in range(legend_height):
+        ratio = i / legend_height
+        color = (int(255 * ratio), int(255 * ratio), int(255 * ratio))
+        pygame.draw.line(screen, color, (sidebar_x, legend_y + i), (sidebar_x + 30, legend_y + i))
+    screen.blit(font_small.render("High", True, (0, 0, 0)), (sidebar_x + 40, legend_y))
+    screen.blit(font_small.render("Low", True, (0, 0, 0)), (sidebar_x + 40, legend_y + legend_height - 15))
+
+    # Start & Goal info
+    info_y = legend_y + legend_height + 50
+    pygame.draw.rect(screen, COLOR_START, (sidebar_x, info_y, 20, 20))
+    screen.blit(font_small.render(f"Start: {start}", True, (0, 0, 0)), (sidebar_x + 30, info_y + 5))
+
+    pygame.draw.rect(screen, COLOR_GOAL, (sidebar_x, info_y + 30, 20, 20))
+    screen.blit(font_small.render(f"Goal: {goal}", True, (0, 0, 0)), (sidebar_x + 30, info_y + 35))
+
+    # Obstacle Legend
+    obs_y = info_y + 60
+    pygame.draw.rect(screen, COLOR_STATIC_OBS, (sidebar_x, obs_y, 20, 20))
+    screen.blit(font_small.render("Static Obstacle", True, (0, 0, 0)), (sidebar_x + 30, obs_y + 5))
+
+    pygame.draw.rect(screen, COLOR_MOVING_OBS, (sidebar_x, obs_y + 30, 20, 20))
+    screen.blit(font_small.render("Moving Obstacle", True, (0, 0, 0)), (sidebar_x + 30, obs_y + 35))
+
+
+def draw_buttons(screen, buttons, font, algo_name, recording):
+    for btn in buttons:
+        if btn.text == algo_name:
+            btn.base_color = (50, 205, 50)
+        elif btn.text in registry.PLANNERS:
+            btn.base_color = (200, 200, 200)
+        # Update Start/Stop Recording text
+        if btn.text.startswith("Start Recording") or btn.text.startswith("Stop Recording"):
+            btn.text = "Stop Recording" if recording else "Start Recording"
+        btn.draw(screen, font)
+
+
+def draw_info(screen, font, info_y, algo_name, metrics, recording):
+    info_text = [
+        f"Algorithm: {algo_name}",
+        f"Time: {metrics['time']} s",
+        f"Length: {metrics['length']}",
+        f"Cost: {metrics['cost']:.2f}",
+        f"OPS: {metrics['ops']:.2f}",
+        f"Recording: {'ON' if recording else 'OFF'}"
+    ]
+    for line in info_text:
+        txt = font.render(line, True, (0, 0, 0))
+        screen.blit(txt, (20, info_y))
+        info_y += 25
+
+
+def capture_frame(screen):
+    """Screen pixels as a (height, width, 3) array for the GIF recorder."""
+    return pygame.surfarray.array3d(screen).swapaxes(0, 1)
+
+
 def dynamic_visualization():
     pygame.init()
     pygame.font.init()
@@ -62,17 +159,14 @@ def dynamic_visualization():
     font = pygame.font.SysFont(None, 24)
     font_small = pygame.font.SysFont(None, 20)
     font_heading = pygame.font.SysFont(None, 28, bold=True)
+    fonts = (font_heading, font_small)
 
     obstacles = MovingObstacles(grid, count=OBSTACLE_COUNT)
     algo_name = "AD*"
-    algo_funcs = {
-        "A*": astar.find_path,
-        "Dijkstra": dijkstra.find_path,
-        "AD*": adstar.find_path,
-        "GA": genetic.find_path,
-        "SA": simulated_annealing.find_path,
-        "SSA": ssa.find_path
-    }
+    # Fitness caches and search state carried over between replans
+    replanner = Replanner()
+    # Runs and convergence histories, written in batches and on exit
+    store = ResultsStore(os.path.join(RESULTS_DIR, "results.db"), batch_size=200)
 
     sidebar_x = grid_area_width + GRID_MARGIN
     button_width = 150
@@ -98,35 +192,16 @@ def dynamic_visualization():
     def set_algo(name):
         nonlocal algo_name, animate_path, metrics, path_step
         algo_name = name
-        t0 = time.time()
-        result = algo_funcs[name](grid)
-        exec_time = round(time.time() - t0, 4)
-
-        convergence = []
-        work_units = 0
-
-        if name in ["GA", "SA", "SSA"]:
-            if isinstance(result, tuple) and len(result) >= 2:
-                animate_path = normalize_path(result[0])
-                convergence = result[1]
-                work_units = result[2] if len(result) > 2 else 0
-            else:
-                animate_path = normalize_path(result)
-
-            if convergence:
-                convergence_data[name] = convergence
-                log_convergence_csv(os.path.join(RESULTS_DIR, f"{name.lower()}_convergence.csv"),
-                                     convergence, name)
-        else:
-            if isinstance(result, tuple) and len(result) == 2:
-                animate_path = normalize_path(result[0])
-                work_units = result[1]
-            else:
-                animate_path = normalize_path(result)
-
-        OPS = work_units / exec_time if exec_time > 0 else 0
-        length = path_length(animate_path, grid)
-        cost = path_cost(animate_path, grid)
+        result = replanner.plan(name, grid)
+        counters = result.counters
+        exec_time = round(result.elapsed, 4)
+        animate_path = result.path
+        if result.history:
+            convergence_data[name] = result.history
+
+        OPS = counters.ops
+        length, cost = path_metrics(animate_path, grid)
+        length, cost = round(length, 2), round(cost, 2)
         metrics = {"time": exec_time, "length": length, "cost": cost, "ops": OPS}
         path_step = 0
 
@@ -138,13 +213,37 @@ def dynamic_visualization():
             "Computing Power (OPS)": OPS
         }
         performance_data.append(row)
-        log_results_csv(os.path.join(RESULTS_DIR, "performance_metrics.csv"), [row])
-        log_computing_power(os.path.join(RESULTS_DIR, "computing_power.csv"), name, exec_time, work_units)
+        run_id = store.add_result("dynamic_vis", f"{grid.width}x{grid.height}", result, grid)
+        if result.history:
+            hit_rates = replanner.fitness_caches[name].history if name in replanner.fitness_caches else None
+            store.add_convergence(run_id, result.history, hit_rates)
+
+    def replan_current():
+        set_algo(algo_name)
+        return animate_path
+
+    def react_to_obstacles():
+        # Try a cheap local detour first, replan from scratch only if it fails
+        # Only the part ahead of the agent (from the cell it stands on) is
+        # repaired, so the walked prefix and path_step stay valid
+        nonlocal animate_path, metrics
+        walked = max(path_step - 1, 0)
+        t0 = time.perf_counter()
+        path, kind, work_units = repair_or_replan(grid, animate_path[walked:], obstacles.positions, replan_current)
+        exec_time = round(time.perf_counter() - t0, 4)
+        if kind != "repair":
+            return  # Path ahead still clear, or set_algo already replaced it and its metrics
+
+        animate_path = animate_path[:walked] + path
+        OPS = work_units / exec_time if exec_time > 0 else 0
+        length, cost = path_metrics(animate_path, grid)
+        metrics = {"time": exec_time, "length": round(length, 2), "cost": round(cost, 2), "ops": OPS}
 
     def reset_simulation():
         nonlocal grid, obstacles, animate_path, metrics, path_step
         grid = Grid()
         obstacles = MovingObstacles(grid, count=OBSTACLE_COUNT)
+        replanner.reset()
         animate_path = []
         path_step = 0
         metrics = {"time": 0, "length": 0, "cost": 0, "ops": 0}
@@ -178,7 +277,7 @@ def dynamic_visualization():
         x, y = 20, grid_area_height + 20
 
         # Row 1: Algorithms
-        for algo in algo_funcs.keys():
+        for algo in registry.names():
             buttons.append(Button(algo, x, y, button_width, button_height, (200, 200, 200), (170, 170, 170),
                                   lambda a=algo: set_algo(a)))
             x += button_width + button_spacing
@@ -214,113 +313,32 @@ def dynamic_visualization():
         frame_count += 1
         if frame_count % UPDATE_INTERVAL == 0:
             obstacles.move()
-            if any(pos in obstacles.positions for pos in animate_path):
-                set_algo(algo_name)
+            react_to_obstacles()
 
         screen.fill(BACKGROUND_COLOR)
 
-        # Draw Grid
-        for y in range(grid.height):
-            for x in range(grid.width):
-                node = grid.get_node(x, y)
-                rect = pygame.Rect(MARGIN + x * (CELL_SIZE + MARGIN),
-                                    MARGIN + y * (CELL_SIZE + MARGIN),
-                                    CELL_SIZE, CELL_SIZE)
-
-                # Drawing logic
-                if (node.x, node.y) == START:
-                    color = COLOR_START
-                elif (node.x, node.y) == GOAL:
-                    color = COLOR_GOAL
-                elif node.is_obstacle:
-                    color = COLOR_STATIC_OBS if node.is_static_obs else COLOR_MOVING_OBS
-                else:
-                    shade = int(255 * (1 - node.height))  # Scale height to grayscale
-                    color = (shade, shade, shade)
-
-                pygame.draw.rect(screen, color, rect)
+        draw_grid(screen, grid)
 
         # Animate Path
         if animate_path:
-            for i in range(min(path_step, len(animate_path))):
-                px, py = animate_path[i]
-                rect = pygame.Rect(MARGIN + px * (CELL_SIZE + MARGIN),
-                                    MARGIN + py * (CELL_SIZE + MARGIN),
-                                    CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(screen, COLORS.get(algo_name, (0, 0, 255)), rect)
+            draw_path(screen, animate_path, path_step, COLORS.get(algo_name, (0, 0, 255)))
             if path_step < len(animate_path):
                 path_step += 1
                 pygame.time.delay(ANIMATION_DELAY)
 
-        # Sidebar: Height Legend and Info
-        pygame.draw.rect(screen, (230, 230, 230), (grid_area_width + GRID_MARGIN, 0, PANEL_WIDTH, grid_area_height))
-
-        # Title
-        legend_title = font_heading.render("Legend & Info", True, (0, 0, 0))
-        screen.blit(legend_title, (sidebar_x, 30))
-
-        # Height gradient
-        legend_y = 80
-        legend_height = 250
-        for i in range(legend_height):
-            ratio = i / legend_height
-            color = (int(255 * ratio), int(255 * ratio), int(255 * ratio))
-            pygame.draw.line(screen, color, (sidebar_x, legend_y + i), (sidebar_x + 30, legend_y + i))
-        screen.blit(font_small.render("High", True, (0, 0, 0)), (sidebar_x + 40, legend_y))
-        screen.blit(font_small.render("Low", True, (0, 0, 0)), (sidebar_x + 40, legend_y + legend_height - 15))
-
-        # Start & Goal info
-        info_y = legend_y + legend_height + 50
-        pygame.draw.rect(screen, COLOR_START, (sidebar_x, info_y, 20, 20))
-        screen.blit(font_small.render(f"Start: {START}", True, (0, 0, 0)), (sidebar_x + 30, info_y + 5))
-        
-        pygame.draw.rect(screen, COLOR_GOAL, (sidebar_x, info_y + 30, 20, 20))
-        screen.blit(font_small.render(f"Goal: {GOAL}", True, (0, 0, 0)), (sidebar_x + 30, info_y + 35))
-
-        # Obstacle Legend
-        obs_y = info_y + 60
-        pygame.draw.rect(screen, COLOR_STATIC_OBS, (sidebar_x, obs_y, 20, 20))
-        screen.blit(font_small.render("Static Obstacle", True, (0, 0, 0)), (sidebar_x + 30, obs_y + 5))
-
-        pygame.draw.rect(screen, COLOR_MOVING_OBS, (sidebar_x, obs_y + 30, 20, 20))
-        screen.blit(font_small.render("Moving Obstacle", True, (0, 0, 0)), (sidebar_x + 30, obs_y + 35))
-
-
-        # Draw Buttons
-        for btn in buttons:
-            if btn.text == algo_name:
-                btn.base_color = (50, 205, 50)
-            elif btn.text in algo_funcs:
-                btn.base_color = (200, 200, 200)
-            # Update Start/Stop Recording text
-            if btn.text.startswith("Start Recording") or btn.text.startswith("Stop Recording"):
-                btn.text = "Stop Recording" if recording else "Start Recording"
-            btn.draw(screen, font)
-
-        # Info Panel
-        info_y = screen_height - 90
-        info_text = [
-            f"Algorithm: {algo_name}",
-            f"Time: {metrics['time']} s",
-            f"Length: {metrics['length']}",
-            f"Cost: {metrics['cost']:.2f}",
-            f"OPS: {metrics['ops']:.2f}",
-            f"Recording: {'ON' if recording else 'OFF'}"
-        ]
-        for line in info_text:
-            txt = font.render(line, True, (0, 0, 0))
-            screen.blit(txt, (20, info_y))
-            info_y += 25
+        draw_legend(screen, fonts, sidebar_x, grid_area_width, grid_area_height)
+        draw_buttons(screen, buttons, font, algo_name, recording)
+        draw_info(screen, font, screen_height - 90, algo_name, metrics, recording)
 
         pygame.display.flip()
 
         # Capture frame for GIF only if recording
         if recording and frame_count % frame_skip == 0:
-            frame = pygame.surfarray.array3d(screen)
-            frames.append(frame.swapaxes(0, 1))
+            frames.append(capture_frame(screen))
 
         clock.tick(30)
 
+    store.close()
     pygame.quit()
 
     if trigger_matplotlib:
@@ -63,6 +63,7 @@ def animate_multiple(grid, algo_paths):
         "Dijkstra": "yellow",
         "GA": "magenta",
         "SA": "orange",
+        "SSA": "purple",
     }
 
     LINE_STYLES = {
@@ -71,6 +72,7 @@ def animate_multiple(grid, algo_paths):
         "Dijkstra": '--',
         "GA": '-.',
         "SA": ':',
+        "SSA": (0, (3, 1, 1, 1)),
     }
 
     MARKERS = {
@@ -79,6 +81,7 @@ def animate_multiple(grid, algo_paths):
         "Dijkstra": 's',
         "GA": '^',
         "SA": 'D',
+        "SSA": 'v',
     }
 
     plots = {}
@@ -28,6 +28,7 @@ class MovingObstacles:
         for x, y in self.positions:
             node = self.grid.get_node(x, y)
             node.is_obstacle = True
+        self.grid.touch()
 
     def move(self):
         new_positions = set()
@@ -10,7 +10,8 @@ COLORS = {
     "Dijkstra": (255, 255, 0),  # Yellow
     "GA": (255, 0, 255),        # Magenta
     "SA": (255, 128, 0),        # Orange
-    "AD*": (0, 255, 128)        # Light Green
+    "AD*": (0, 255, 128),       # Light Green
+    "SSA": (128, 0, 255)        # Purple
 }
 
 BACKGROUND_COLOR = (240, 240, 240)  # Light gray background
@@ -36,6 +37,45 @@ class Button:
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
+def cell_rect(x, y):
+    return pygame.Rect(MARGIN + x * (CELL + MARGIN), MARGIN + y * (CELL + MARGIN), CELL, CELL)
+
+def draw_grid(screen, grid, start=START, goal=GOAL):
+    for y in range(grid.height):
+        for x in range(grid.width):
+            node = grid.get_node(x, y)
+            if node.is_obstacle:
+                pygame.draw.rect(screen, (50, 50, 50), cell_rect(x, y))
+            else:
+                shade = int(255 * (1 - node.height))
+                pygame.draw.rect(screen, (shade, shade, shade), cell_rect(x, y))
+
+    # Draw Start & Goal
+    pygame.draw.rect(screen, (0, 255, 0), cell_rect(*start))  # Green for Start
+    pygame.draw.rect(screen, (255, 0, 0), cell_rect(*goal))  # Red for Goal
+
+def draw_path(screen, path, steps, color):
+    """First steps cells of path."""
+    for x, y in path[:steps]:
+        pygame.draw.rect(screen, color, cell_rect(x, y))
+
+def draw_legend(screen, font_small, w, grid):
+    """Height legend right of the grid (w = grid area width)."""
+    legend_x = w + 20
+    legend_y = 50
+    legend_height = grid.height * CELL
+
+    for i in range(legend_height):
+        ratio = (i / legend_height)  # top=high, bottom=low
+        color = (int(255 * ratio), int(255 * ratio), int(255 * ratio))
+        pygame.draw.line(screen, color, (legend_x, legend_y + i), (legend_x + 20, legend_y + i))
+
+    # Legend labels
+    high_text = font_small.render("High", True, (0, 0, 0))
+    low_text = font_small.render("Low", True, (0, 0, 0))
+    screen.blit(high_text, (legend_x + 30, legend_y - 10))
+    screen.blit(low_text, (legend_x + 30, legend_y + legend_height - 10))
+
 def display_multiple(grid, algo_paths):
     pygame.init()
     legend_width = 140
@@ -97,26 +137,7 @@ def display_multiple(grid, algo_paths):
 
         screen.fill(BACKGROUND_COLOR)
 
-        # Draw grid
-        for y in range(grid.height):
-            for x in range(grid.width):
-                node = grid.get_node(x, y)
-                rect = pygame.Rect(MARGIN + x * (CELL + MARGIN),
-                                    MARGIN + y * (CELL + MARGIN),
-                                    CELL, CELL)
-                if node.is_obstacle:
-                    pygame.draw.rect(screen, (50, 50, 50), rect)
-                else:
-                    shade = int(255 * (1 - node.height))
-                    pygame.draw.rect(screen, (shade, shade, shade), rect)
-
-        # Draw Start & Goal
-        sx, sy = START
-        gx, gy = GOAL
-        s_rect = pygame.Rect(MARGIN + sx * (CELL + MARGIN), MARGIN + sy * (CELL + MARGIN), CELL, CELL)
-        g_rect = pygame.Rect(MARGIN + gx * (CELL + MARGIN), MARGIN + gy * (CELL + MARGIN), CELL, CELL)
-        pygame.draw.rect(screen, (0, 255, 0), s_rect)  # Green for Start
-        pygame.draw.rect(screen, (255, 0, 0), g_rect)  # Red for Goal
+        draw_grid(screen, grid)
 
         # Draw Buttons
         for btn in buttons:
@@ -125,13 +146,7 @@ def display_multiple(grid, algo_paths):
         # Animate selected algorithm path
         if current_algo:
             path = algo_paths[current_algo]
-            color = COLORS.get(current_algo, (255, 255, 255))
-            for i in range(min(step, len(path))):
-                x, y = path[i]
-                rect = pygame.Rect(MARGIN + x * (CELL + MARGIN),
-                                    MARGIN + y * (CELL + MARGIN),
-                                    CELL, CELL)
-                pygame.draw.rect(screen, color, rect)
+            draw_path(screen, path, step, COLORS.get(current_algo, (255, 255, 255)))
 
             if not paused and step < len(path):
                 step += 1
@@ -141,21 +156,7 @@ def display_multiple(grid, algo_paths):
             txt_surface = font.render(status_text, True, (0, 0, 0))
             screen.blit(txt_surface, (10, 10))
 
-        # Draw Height Legend
-        legend_x = w + 20
-        legend_y = 50
-        legend_height = grid.height * CELL
-
-        for i in range(legend_height):
-            ratio = (i / legend_height)  # top=high, bottom=low
-            color = (int(255 * ratio), int(255 * ratio), int(255 * ratio))
-            pygame.draw.line(screen, color, (legend_x, legend_y + i), (legend_x + 20, legend_y + i))
-
-        # Legend labels
-        high_text = font_small.render("High", True, (0, 0, 0))
-        low_text = font_small.render("Low", True, (0, 0, 0))
-        screen.blit(high_text, (legend_x + 30, legend_y - 10))
-        screen.blit(low_text, (legend_x + 30, legend_y + legend_height - 10))
+        draw_legend(screen, font_small, w, grid)
 
         pygame.display.flip()
         clock.tick(10)  # Animation speed
@@ -1,7 +1,8 @@
 import csv
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
+from utils.results_store import ResultsStore
+
+# pandas and matplotlib are imported inside the plot functions, so logging alone stays light
 
 def log_results_csv(filepath, results):
     """
@@ -14,30 +15,19 @@ def log_results_csv(filepath, results):
             writer.writeheader()
         writer.writerows(results)
 
-def log_convergence_csv(filepath, values, algo_name):
-    with open(filepath, mode='w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["Iteration", "Best Cost", "Algorithm"])
-        for i, val in enumerate(values):
-            writer.writerow([i, val, algo_name])
+# Column names differ between writers: main.run_all vs ui.dynamic_vis
+COST_COLUMNS = ("Path Cost", "Path Cost (Adaptive Elevation)")
+LENGTH_COLUMNS = ("Path Length", "Path Length (Adaptive 3D)")
 
-# Log computing power
-def log_computing_power(filepath, algo_name, time_sec, work_units):
-    ops = work_units / time_sec if time_sec > 0 else 0
-    row = {
-        "Algorithm": algo_name,
-        "Time (s)": round(time_sec, 4),
-        "Work Units": work_units,
-        "OPS": round(ops, 2)
-    }
-    file_exists = os.path.exists(filepath)
-    with open(filepath, mode='a', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=row.keys())
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+def pick_column(df, names):
+    for name in names:
+        if name in df.columns:
+            return name
+    raise KeyError(f"None of {names} in {list(df.columns)}")
 
 def plot_performance_metrics(csv_path="results/performance_metrics.csv"):
+    import pandas as pd
+    import matplotlib.pyplot as plt
     df = pd.read_csv(csv_path)
 
     # Execution Time
@@ -51,27 +41,34 @@ def plot_performance_metrics(csv_path="results/performance_metrics.csv"):
 
     # Path Cost with elevation
     plt.figure(figsize=(8, 5))
-    plt.bar(df["Algorithm"], df["Path Cost (elevation)"], color='lightcoral')
+    plt.bar(df["Algorithm"], df[pick_column(df, COST_COLUMNS)], color='lightcoral')
     plt.title("Path Cost by Algorithm (with Elevation)")
     plt.ylabel("Cost")
     plt.grid(True, axis='y')
     plt.tight_layout()
     plt.savefig("results/path_cost.png")
 
-    # Path Length in 3D
+    # Path Length
     plt.figure(figsize=(8, 5))
-    plt.bar(df["Algorithm"], df["Path Length (3D)"], color='mediumseagreen')
-    plt.title("Path Length by Algorithm (3D)")
-    plt.ylabel("Distance")
+    plt.bar(df["Algorithm"], df[pick_column(df, LENGTH_COLUMNS)], color='mediumseagreen')
+    plt.title("Path Length by Algorithm")
+    plt.ylabel("Length")
     plt.grid(True, axis='y')
     plt.tight_layout()
     plt.savefig("results/path_length.png")
 
 # Plot computing power
-def plot_computing_power(csv_path="results/computing_power.csv"):
-    df = pd.read_csv(csv_path)
+def plot_computing_power(db_path="results/results.db", campaign="run_all"):
+    """Mean work units per second (OPS) of each algorithm's stored runs."""
+    import matplotlib.pyplot as plt
+    with ResultsStore(db_path) as store:
+        rows = store.query("""
+            SELECT algorithm, AVG(work_units / time_s) FROM runs
+            WHERE campaign = ? AND time_s > 0 AND work_units IS NOT NULL
+            GROUP BY algorithm ORDER BY algorithm""", (campaign,))
     plt.figure(figsize=(8, 5))
-    plt.bar(df["Algorithm"], df["OPS"], color=['cyan', 'yellow', 'magenta', 'orange', 'green'])
+    plt.bar([algo for algo, _ in rows], [ops for _, ops in rows],
+            color=['cyan', 'yellow', 'magenta', 'orange', 'green', 'purple'])
     plt.title("Computing Power (OPS)")
     plt.ylabel("Operations per Second")
     plt.grid(True, axis='y')
@@ -79,30 +76,24 @@ def plot_computing_power(csv_path="results/computing_power.csv"):
     plt.savefig("results/computing_power.png")
     plt.show()
 
-def plot_convergence(ga_csv="results/ga_convergence.csv", sa_csv="results/sa_convergence.csv"):
-    ga_df = pd.read_csv(ga_csv)
-    sa_df = pd.read_csv(sa_csv)
+def plot_convergence(db_path="results/results.db", algorithms=(("GA", "magenta"), ("SA", "orange")),
+                     campaign="run_all"):
+    """Plot the latest stored convergence history of each algorithm; only those runs are read."""
+    import matplotlib.pyplot as plt
+    with ResultsStore(db_path) as store:
+        for algo, color in algorithms:
+            run_id = store.latest_run(algo, campaign)
+            if run_id is None:
+                continue
+            iterations, best_cost, _ = store.convergence(run_id)
 
-    # GA Convergence
-    plt.figure(figsize=(10, 6))
-    plt.plot(ga_df["Iteration"], ga_df["Best Cost"], label="GA", color="magenta", linewidth=2)
-    plt.title("Genetic Algorithm Convergence")
-    plt.xlabel("Iteration")
-    plt.ylabel("Best Path Cost")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig("results/ga_convergence_plot.png")
-    plt.show()
-
-    # SA Convergence
-    plt.figure(figsize=(10, 6))
-    plt.plot(sa_df["Iteration"], sa_df["Best Cost"], label="SA", color="orange", linewidth=2)
-    plt.title("Simulated Annealing Convergence")
-    plt.xlabel("Iteration")
-    plt.ylabel("Best Path Cost")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig("results/sa_convergence_plot.png")
-    plt.show()
+            plt.figure(figsize=(10, 6))
+            plt.plot(iterations, best_cost, label=algo, color=color, linewidth=2)
+            plt.title(f"{algo} Convergence (run {run_id})")
+            plt.xlabel("Iteration")
+            plt.ylabel("Best Path Cost")
+            plt.grid(True)
+            plt.legend()
+            plt.tight_layout()
+            plt.savefig(f"results/{algo.lower()}_convergence_plot.png")
+            plt.show()
@@ -1,34 +1,51 @@
-import math
+import itertools
+import numpy as np
 
-def path_length(path, grid, alpha=2.0, power=2):
+
+def _height_array(grid):
+    return grid.cached("height_array", lambda g: np.array([n.height for row in g.nodes for n in row],
+                                                          dtype=np.float64))
+
+
+def path_metrics(path, grid, alpha=2.0, beta=1.0, power=2):
     """
-    Path length with adaptive elevation penalty.
-    alpha: penalty factor for slope
-    power: exponent for slope steepness
+    (length, cost) of a path with adaptive elevation penalty, in one
+    vectorized pass over its coordinates. Not rounded: round when reporting.
+
+    length: sum of base distance * (1 + alpha * dz^power)
+    cost:   length plus beta * dz^power per segment
+
+    Segments are summed in path order (cumsum), so the cost is bit-identical
+    to adding segment costs one by one, as the planners and the batched
+    fitness evaluator do.
     """
     if not path or len(path) < 2:
-        return 0.0
+        return 0.0, 0.0
 
-    total_length = 0.0
-    for i in range(len(path) - 1):
-        x1, y1 = path[i]
-        x2, y2 = path[i + 1]
-        node1 = grid.get_node(x1, y1)
-        node2 = grid.get_node(x2, y2)
+    coords = np.fromiter(itertools.chain.from_iterable(path), dtype=np.int64, count=2 * len(path))
+    xs, ys = coords[0::2], coords[1::2]
+    heights = _height_array(grid)[ys * grid.width + xs]
 
-        dx, dy = x2 - x1, y2 - y1
-        dz = abs(node2.height - node1.height)
+    dx = np.diff(xs)
+    dy = np.diff(ys)
+    dz = np.abs(np.diff(heights))
 
-        # Base horizontal distance
-        base_dist = math.sqrt(dx**2 + dy**2)
+    # Base horizontal distance and adaptive penalty
+    base_dist = np.sqrt((dx * dx + dy * dy).astype(np.float64))
+    slope = dz ** power
+    segment_length = base_dist * (1 + alpha * slope)
+    segment_cost = segment_length + (beta * slope)
 
-        # Adaptive penalty
-        penalty_factor = 1 + alpha * (dz ** power)
-        segment_length = base_dist * penalty_factor
+    return float(np.cumsum(segment_length)[-1]), float(np.cumsum(segment_cost)[-1])
 
-        total_length += segment_length
 
-    return round(total_length, 4)
+def path_length(path, grid, alpha=2.0, power=2):
+    """
+    Path length with adaptive elevation penalty.
+    alpha: penalty factor for slope
+    power: exponent for slope steepness
+    """
+    return path_metrics(path, grid, alpha=alpha, power=power)[0]
 
 
 def path_cost(path, grid, alpha=2.0, beta=1.0, power=2):
@@ -38,26 +55,5 @@ def path_cost(path, grid, alpha=2.0, beta=1.0, power=2):
     beta: additional cost for elevation change
     power: exponent for slope steepness
     """
-    if not path or len(path) < 2:
-        return 0.0
-
-    total_cost = 0.0
-    for i in range(len(path) - 1):
-        x1, y1 = path[i]
-        x2, y2 = path[i + 1]
-        node1 = grid.get_node(x1, y1)
-        node2 = grid.get_node(x2, y2)
-
-        dx, dy = x2 - x1, y2 - y1
-        dz = abs(node2.height - node1.height)
-
-        # Base horizontal distance
-        base_dist = math.sqrt(dx**2 + dy**2)
-
-        # Adaptive penalties
-        penalty_factor = 1 + alpha * (dz ** power)
-        segment_cost = (base_dist * penalty_factor) + (beta * (dz ** power))
-
-        total_cost += segment_cost
+    return path_metrics(path, grid, alpha, beta, power)[1]
 
-    return round(total_cost, 4)
\ No newline at end of file
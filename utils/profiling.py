@@ -0,0 +1,85 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_DIR = os.path.join("results", "profiles")
+
+
+def file_stem(algorithm, scenario):
+    """File-name-safe "<algorithm>_<scenario>", e.g. ("A*", "30x30 seed 1") -> "Astar_30x30_seed_1"."""
+    name = f"{algorithm.replace('*', 'star')}_{scenario}"
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+
+
+@contextmanager
+def profile_run(algorithm, scenario, enabled=True, directory=PROFILE_DIR, top=15):
+    """
+    Profile the enclosed block with cProfile and tracemalloc. Writes, under
+    directory:
+        <stem>.prof          raw cProfile stats (snakeviz, pstats, ...)
+        <stem>_summary.txt   peak traced memory, the top hot functions by
+                             cumulative and by own time, top allocation sites
+                             still held at the end
+    where stem is file_stem(algorithm, scenario). Yields a dict that is
+    filled with peak_kb, hot (top functions by own time) and the file paths
+    when the block ends. With enabled False it only yields None, so call
+    sites can keep a single code path.
+
+    Profiling slows the run down several times, so time it separately.
+    """
+    if not enabled:
+        yield None
+        return
+
+    summary = {"algorithm": algorithm, "scenario": scenario}
+    profiler = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler.enable()
+    try:
+        yield summary
+    finally:
+        profiler.disable()
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot()
+        if not tracing:
+            tracemalloc.stop()
+
+        os.makedirs(directory, exist_ok=True)
+        stem = file_stem(algorithm, scenario)
+        prof_path = os.path.join(directory, f"{stem}.prof")
+        summary_path = os.path.join(directory, f"{stem}_summary.txt")
+        profiler.dump_stats(prof_path)
+
+        stats = pstats.Stats(profiler)
+        hot = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        summary.update({
+            "peak_kb": round(peak / 1024, 1),
+            "hot": [(pstats.func_std_string(func), round(tottime, 4)) for func, (_, _, tottime, _, _) in hot],
+            "profile": prof_path,
+            "summary": summary_path,
+        })
+
+        with open(summary_path, "w") as f:
+            f.write(f"{algorithm} / {scenario}\n")
+            f.write(f"Peak traced memory: {summary['peak_kb']} KiB\n\n")
+            for sort_key in ("cumulative", "tottime"):
+                text = io.StringIO()
+                pstats.Stats(profiler, stream=text).sort_stats(sort_key).print_stats(top)
+                f.write(f"--- Top {top} by {sort_key} time ---\n")
+                f.write(text.getvalue())
+            f.write(f"\n--- Top {top} allocation sites still held when the run ended ---\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
+
+
+def describe(summary, count=3):
+    """One-line digest of a profile_run summary: peak memory and the hottest functions."""
+    hot = "; ".join(f"{name} {seconds}s" for name, seconds in summary["hot"][:count])
+    return f"{summary['algorithm']} / {summary['scenario']}: peak {summary['peak_kb']} KiB, hot: {hot}"
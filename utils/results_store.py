@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import time
+import numpy as np
+from algorithms.instrumentation import Counters
+from utils.metrics import path_metrics
+
+RUN_COLUMNS = ("run_id", "campaign", "scenario", "algorithm", "created", "time_s", "path_cells", "path_length_3d",
+               "path_cost", "reached", "work_units", "stop_reason") + Counters.FIELDS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    campaign TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    created REAL NOT NULL,
+    time_s REAL,
+    path_cells INTEGER,
+    path_length_3d REAL,
+    path_cost REAL,
+    reached INTEGER,
+    work_units INTEGER,
+    stop_reason TEXT,
+    {", ".join(f"{name} INTEGER" for name in Counters.FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS runs_scenario_algorithm ON runs (scenario, algorithm);
+CREATE INDEX IF NOT EXISTS runs_campaign ON runs (campaign, algorithm);
+CREATE TABLE IF NOT EXISTS histories (
+    run_id INTEGER PRIMARY KEY,
+    length INTEGER NOT NULL,
+    every INTEGER NOT NULL,
+    iterations BLOB,
+    best_cost BLOB NOT NULL,
+    cache_hit_rate BLOB
+);
+"""
+
+
+def downsample(values, every):
+    """
+    Indices of values to keep: every every-th iteration, each iteration that
+    improves on the best value so far, and the last one.
+    """
+    values = np.asarray(values, dtype=float)
+    index = np.arange(len(values))
+    if every <= 1 or len(values) == 0:
+        return index
+    best_before = np.concatenate(([np.inf], np.minimum.accumulate(values)[:-1]))
+    keep = (index % every == 0) | (values < best_before)
+    keep[-1] = True
+    return index[keep]
+
+
+class ResultsStore:
+    """
+    Buffered SQLite sink for run results, replacing one CSV append per run.
+
+    add_run() and add_convergence() only queue rows; they are written in one
+    transaction per batch_size rows and on flush() / close() (or leaving a
+    with block). Every run gets a run_id, unique within the file, that its
+    convergence history points to. Rows are indexed by (scenario, algorithm)
+    and by (campaign, algorithm), so aggregates over large campaigns are plain
+    SQL queries (see summary()).
+
+    A convergence history is one row per run holding little-endian float64
+    blobs (uint32 for the kept iteration numbers), downsampled to every
+    every-th iteration plus improvement points when every > 1.
+
+    Each run column has one meaning, whoever writes it (see add_result()):
+    path_cells is the number of cells on the path, path_length_3d its
+    elevation-penalised length (utils.metrics.path_metrics), path_cost its
+    cost (NULL without a path, reached tells whether it ends at the goal) and
+    work_units is Counters.work_units (expansions + fitness evaluations).
+    Files from before path_cells existed keep their old, mixed path_length
+    column, which is no longer written.
+
+    Run ids are allocated in this process, so use one writer per file at a time.
+    """
+
+    def __init__(self, path=os.path.join("results", "results.db"), batch_size=1000, every=1):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.every = every
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # Files written before a column existed get it added (NULL for their old rows)
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        for name in RUN_COLUMNS:
+            if name not in existing:
+                self.conn.execute(f"ALTER TABLE runs ADD COLUMN {name}")
+        self.next_id = self.conn.execute("SELECT COALESCE(MAX(run_id), 0) + 1 FROM runs").fetchone()[0]
+        self.runs = []
+        self.histories = []
+
+    def add_run(self, campaign, scenario, algorithm, time_s=None, path_cells=None, path_length_3d=None,
+                path_cost=None, reached=None, counters=None, stop_reason=None):
+        """
+        Queue one run; returns its run_id. counters (an instrumentation.Counters)
+        fills work_units and the counter columns; stop_reason is a
+        PlanResult.stop_reason.
+        """
+        run_id = self.next_id
+        self.next_id += 1
+        counts = counters.as_dict() if counters is not None else {}
+        work_units = counters.work_units if counters is not None else None
+        self.runs.append((run_id, campaign, scenario, algorithm, time.time(), time_s, path_cells, path_length_3d,
+                          path_cost, None if reached is None else int(bool(reached)), work_units, stop_reason)
+                         + tuple(counts.get(name) for name in Counters.FIELDS))
+        self._maybe_flush()
+        return run_id
+
+    def add_result(self, campaign, scenario, result, grid):
+        """Queue a registry.PlanResult found on grid (add_run with every column derived from it); returns its run_id."""
+        length_3d, _ = path_metrics(result.path, grid) if result.path else (None, None)
+        return self.add_run(campaign, scenario, result.algorithm, result.elapsed, len(result.path), length_3d,
+                            result.cost if result.path else None, result.reached, result.counters,
+                            result.stop_reason)
+
+    def add_convergence(self, run_id, values, hit_rates=None, every=None):
+        """
+        Queue the convergence history of run_id: best cost per iteration and
+        optionally the cache hit rate per iteration (NaN where missing).
+        every overrides the store's downsampling interval.
+        """
+        every = self.every if every is None else every
+        values = np.asarray(values, dtype="<f8")
+        keep = downsample(values, every)
+        rates = None
+        if hit_rates is not None:
+            padded = np.full(len(values), np.nan, dtype="<f8")
+            count = min(len(hit_rates), len(values))
+            padded[:count] = np.asarray(hit_rates, dtype=float)[:count]
+            rates = padded[keep].tobytes()
+        iterations = keep.astype("<u4").tobytes() if every > 1 else None
+        self.histories.append((run_id, len(values), every, iterations, values[keep].tobytes(), rates))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self.runs) + len(self.histories) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.runs and not self.histories:
+            return
+        with self.conn:
+            self.conn.executemany(f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) "
+                                  f"VALUES ({', '.join('?' * len(RUN_COLUMNS))})", self.runs)
+            self.conn.executemany("INSERT INTO histories VALUES (?, ?, ?, ?, ?, ?)", self.histories)
+        self.runs = []
+        self.histories = []
+
+    def convergence(self, run_id):
+        """(iterations, best_cost, hit_rates or None) arrays of one run, or None if it has no history."""
+        row = self.query("SELECT length, iterations, best_cost, cache_hit_rate FROM histories WHERE run_id = ?",
+                         (run_id,))
+        if not row:
+            return None
+        length, iterations, best_cost, rates = row[0]
+        values = np.frombuffer(best_cost, dtype="<f8")
+        index = np.arange(length) if iterations is None else np.frombuffer(iterations, dtype="<u4")
+        return index, values, None if rates is None else np.frombuffer(rates, dtype="<f8")
+
+    def latest_run(self, algorithm, campaign=None):
+        """run_id of the most recent run of algorithm that has a convergence history, or None."""
+        where = "AND r.campaign = ?" if campaign is not None else ""
+        row = self.query(f"""
+            SELECT MAX(r.run_id) FROM runs r JOIN histories h ON h.run_id = r.run_id
+            WHERE r.algorithm = ? {where}""", (algorithm,) + ((campaign,) if campaign is not None else ()))
+        return row[0][0]
+
+    def query(self, sql, params=()):
+        """Flush, then run sql and return all rows."""
+        self.flush()
+        return self.conn.execute(sql, params).fetchall()
+
+    def summary(self, campaign=None):
+        """Per-algorithm (algorithm, runs, mean time, mean cost of reaching runs, reached rate)."""
+        where = "WHERE campaign = ?" if campaign is not None else ""
+        return self.query(f"""
+            SELECT algorithm, COUNT(*), AVG(time_s), AVG(CASE WHEN reached THEN path_cost END), AVG(reached)
+            FROM runs {where} GROUP BY algorithm ORDER BY algorithm""",
+                          (campaign,) if campaign is not None else ())
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -3,9 +3,9 @@ import time
 def timer(func):
     """Decorator to print execution time of a function."""
     def wrapper(*args, **kwargs):
-        start = time.time()
+        start = time.perf_counter()
         res = func(*args, **kwargs)
-        elapsed = time.time() - start
+        elapsed = time.perf_counter() - start
         print(f"{func.__name__} took {elapsed:.4f}s")
         return res
     return wrapper